@@ -0,0 +1,19 @@
+# https://docs.peewee-orm.com/en/latest/peewee/playhouse.html#schema-migrations
+
+import peewee
+import playhouse.migrate
+
+import pycamp_bot.models
+
+
+my_db = peewee.SqliteDatabase('pycamp_projects.db')
+migrator = playhouse.migrate.SqliteMigrator(my_db)
+
+
+playhouse.migrate.migrate(
+    migrator.add_index(
+        pycamp_bot.models.Pycampista._meta.table_name,
+        ('admin',),
+        False,
+    ),
+)
@@ -0,0 +1,40 @@
+# https://docs.peewee-orm.com/en/latest/peewee/playhouse.html#schema-migrations
+
+import peewee
+import playhouse.migrate
+
+import pycamp_bot.models
+
+
+my_db = peewee.SqliteDatabase('pycamp_projects.db')
+migrator = playhouse.migrate.SqliteMigrator(my_db)
+
+
+# Same columns and index names peewee uses when it creates the tables
+playhouse.migrate.migrate(
+    migrator.add_index(
+        pycamp_bot.models.Vote._meta.table_name,
+        ('project_id', 'interest'),
+        False,
+    ),
+    migrator.add_index(
+        pycamp_bot.models.Vote._meta.table_name,
+        ('pycampista_id', 'interest'),
+        False,
+    ),
+    migrator.add_index(
+        pycamp_bot.models.WizardAtPycamp._meta.table_name,
+        ('pycamp_id', 'init', 'end'),
+        False,
+    ),
+    migrator.add_index(
+        pycamp_bot.models.WizardAtPycamp._meta.table_name,
+        ('pycamp_id', 'wizard_id'),
+        False,
+    ),
+    migrator.add_index(
+        pycamp_bot.models.Slot._meta.table_name,
+        ('code',),
+        False,
+    ),
+)
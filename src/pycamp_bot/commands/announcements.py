@@ -1,7 +1,7 @@
 from telegram import Update, Bot
 from telegram.ext import ConversationHandler, CommandHandler, MessageHandler, filters, CallbackContext
 from pycamp_bot.models import Project, Pycampista, Vote
-from pycamp_bot.commands.auth import get_admins_username
+from pycamp_bot.commands.auth import username_is_admin
 from pycamp_bot.logger import logger
 from pycamp_bot.commands.manage_pycamp import active_needed
 from pycamp_bot.utils import escape_markdown
@@ -29,7 +29,7 @@ class AnnouncementState:
 state = AnnouncementState()
 
 async def user_is_admin(pycampist: str) -> bool:
-    return pycampist in get_admins_username()
+    return username_is_admin(pycampist)
 
 async def should_be_able_to_announce(pycampista: str, proyect: Project) -> bool:
     return pycampista == proyect.owner.username or await user_is_admin(pycampista)
@@ -179,7 +179,7 @@ async def message_project(update: Update, context: CallbackContext) -> str:
     pycampistas: list[Vote] = Vote.select().join(
         Pycampista).where(
         (Vote.project == Project.select().where(
-            Project.name == state.current_project.name)) & (Vote.interest))
+            Project.name == state.current_project.name)) & (Vote.interest == True))
     chat_id_list: list[int] = [user.pycampista.chat_id for user in pycampistas]
     for chat_id in chat_id_list:
         try:
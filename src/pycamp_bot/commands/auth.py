@@ -6,20 +6,18 @@ from pycamp_bot.utils import escape_markdown
 
 
 def get_admins_username():
-    admins = []
-    pycampistas = Pycampista.select()
-    for user in pycampistas:
-        if user.admin:
-            admins.append(user.username)
-    return admins
+    return sorted(Pycampista.get_admin_usernames())
+
+
+def username_is_admin(username):
+    return username in Pycampista.get_admin_usernames()
 
 
 def is_admin(update, context):
     """Checks if the user is authorized as admin"""
     username = update.message.from_user.username
-    authorized = get_admins_username()
 
-    if username not in authorized:
+    if not username_is_admin(username):
         logger.info("{} is not authorized as admin".format(username))
         return False
     else:
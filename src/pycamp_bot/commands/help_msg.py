@@ -69,6 +69,8 @@ Por default usa datetime\\.now\\(\\)
 /cambiar\\_slot: Toma el nombre de un proyecto y el nuevo slot \
     y lo cambia en el cronograma\\.
 /borrar\\_cronograma: Borra el cronograma actual para poder volver a usar /cronogramear\\.
+/recronogramear: Actualiza el cronograma con los votos y proyectos nuevos, \
+    moviendo la menor cantidad posible de proyectos\\.
 
 **Gestión de magxs**
 
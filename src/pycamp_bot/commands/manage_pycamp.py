@@ -23,10 +23,8 @@ def get_pycamp_by_name(name):
 
 
 def get_active_pycamp():
-    active = Pycamp.select().where(Pycamp.active)
-    if active.count() == 0:
-        return False, None
-    return True, active[0]
+    pycamp = Pycamp.get_active()
+    return pycamp is not None, pycamp
 
 
 def active_needed(f):
@@ -8,7 +8,7 @@ from telegram.ext import CallbackQueryHandler, CommandHandler, ConversationHandl
 from pycamp_bot.models import Pycampista, Project, Slot, Vote
 from pycamp_bot.commands.base import msg_to_active_pycamp_chat
 from pycamp_bot.commands.manage_pycamp import active_needed, get_active_pycamp
-from pycamp_bot.commands.auth import admin_needed, get_admins_username
+from pycamp_bot.commands.auth import admin_needed, username_is_admin
 from pycamp_bot.utils import escape_markdown, get_slot_weekday_name
 
 current_projects = {}
@@ -434,7 +434,7 @@ async def delete_project(update, context):
             )
             return
 
-    if username != project.owner.username and username not in get_admins_username():
+    if username != project.owner.username and not username_is_admin(username):
         await context.bot.send_message(
             chat_id=update.message.chat_id,
             text="No sos ni admin ni el owner de este proyecto, Careta."
@@ -475,7 +475,7 @@ async def show_projects(update, context):
             escape_markdown(project.group_url or '(ninguno)'),
         )
         participants_count = Vote.select().where(
-            (Vote.project == project) & (Vote.interest)).count()
+            (Vote.project == project) & (Vote.interest == True)).count()
         if participants_count > 0:
             project_text += "\nInteresades: {}".format(participants_count)
 
@@ -509,7 +509,7 @@ async def show_participants(update, context):
         return
 
     votes = Vote.select().where(
-            (Vote.project == project) & (Vote.interest))
+            (Vote.project == project) & (Vote.interest == True))
     participants = set()
     for vote in votes:
         participants.add(vote.pycampista.username)
@@ -534,7 +534,7 @@ async def show_my_projects(update, context):
         .join(Slot, join_type=JOIN.LEFT_OUTER)
         .where(
             (Vote.pycampista == user) &
-            Vote.interest
+            (Vote.interest == True)
         )
         .order_by(Slot.code)
     )
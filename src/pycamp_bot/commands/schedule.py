@@ -1,3 +1,4 @@
+import asyncio
 import string
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -8,12 +9,18 @@ from telegram.ext import (
     filters,
 )
 from pycamp_bot.models import Project, Slot, Pycampista, Vote
-from pycamp_bot.commands.auth import admin_needed, get_admins_username
-from pycamp_bot.scheduler.db_to_json import export_db_2_json
-from pycamp_bot.scheduler.schedule_calculator import export_scheduled_result
+from pycamp_bot.commands.auth import admin_needed, username_is_admin
+from pycamp_bot.logger import logger
+from pycamp_bot.scheduler.db_to_json import build_schedule_problem, export_current_schedule
+from pycamp_bot.scheduler.schedule_calculator import (
+    reschedule_problem, schedule_problem, throttle,
+)
 from pycamp_bot.utils import escape_markdown, get_slot_weekday_name
 
 
+PROGRESS_LOG_INTERVAL = 5  # Seconds between schedule progress logs
+SCHEDULE_RUNNING = 'schedule_running'  # bot_data key set while a schedule is computed
+
 DAY_SLOT_TIME = {
     'day':[], # Guarda el codigo del dia ej: ['A','B']
     'slot':[], # Guarda la cantidad de slots del dia iterado ej [5] (se sobreescribe)
@@ -128,26 +135,125 @@ async def create_slot(update, context):
         return ConversationHandler.END
 
 
+async def schedule_already_running(context, chat_id):
+    """Tells the admin when a schedule is being computed, two would overwrite each other."""
+    if not context.bot_data.get(SCHEDULE_RUNNING):
+        return False
+    await context.bot.send_message(
+        chat_id=chat_id,
+        text="Ya se está generando un cronograma. Esperá a que termine."
+    )
+    return True
+
+
 async def make_schedule(update, context):
+    chat_id = update.message.chat_id
+    if await schedule_already_running(context, chat_id):
+        return
+
     await context.bot.send_message(
-        chat_id=update.message.chat_id,
-        text="Generando el Cronograma..."
+        chat_id=chat_id,
+        text="Generando el Cronograma... Te aviso cuando esté listo."
     )
 
-    data_json = export_db_2_json()
-    my_schedule = export_scheduled_result(data_json)
+    problem = build_schedule_problem()
+    context.bot_data[SCHEDULE_RUNNING] = True
+    context.application.create_task(
+        compute_schedule(
+            context, chat_id, schedule_problem, problem,
+            progress_callback=throttle(log_progress, PROGRESS_LOG_INTERVAL),
+        ),
+        update=update
+    )
 
-    for relationship in my_schedule:
-        slot = Slot.get(Slot.code == relationship[1])
-        project = Project.get(Project.name == relationship[0])
-        project.slot = slot.id
-        project.save()
+
+def log_progress(event):
+    logger.info(
+        "Schedule progress: iteration %d, best value %.2f, %.1fs, %d evaluations",
+        event.iteration, event.best_value, event.elapsed, event.evaluations,
+    )
+
+
+@admin_needed
+async def reschedule(update, context):
+    chat_id = update.message.chat_id
+    if not Slot.select().exists():
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text="No hay cronograma para actualizar. Usá /cronogramear."
+        )
+        return
+    if await schedule_already_running(context, chat_id):
+        return
 
     await context.bot.send_message(
-        chat_id=update.message.chat_id,
-        text="Cronograma Generado!"
+        chat_id=chat_id,
+        text="Actualizando el Cronograma... Te aviso cuando esté listo."
     )
 
+    problem = build_schedule_problem()
+    current_schedule = export_current_schedule()
+    context.bot_data[SCHEDULE_RUNNING] = True
+    context.application.create_task(
+        compute_schedule(context, chat_id, reschedule_problem, problem, current_schedule),
+        update=update
+    )
+
+
+def save_schedule(my_schedule):
+    """
+    Saves the (project name, slot code) pairs. Returns how many projects
+    changed slot, how many had no slot and were placed, and how many pairs
+    were skipped because their project or slot was deleted while the
+    schedule was computed.
+    """
+    slots = {slot.code: slot.id for slot in Slot.select()}
+    projects = {project.name: project for project in Project.select()}
+    moved = 0
+    placed = 0
+    skipped = 0
+    for project_name, slot_code in my_schedule:
+        if project_name not in projects or slot_code not in slots:
+            logger.warning("Skipping %s in slot %s, it no longer exists", project_name, slot_code)
+            skipped += 1
+            continue
+        project = projects[project_name]
+        if project.slot_id == slots[slot_code]:
+            continue
+        if project.slot_id is None:
+            placed += 1
+        else:
+            moved += 1
+        project.slot = slots[slot_code]
+        project.save()
+    return moved, placed, skipped
+
+
+async def compute_schedule(context, chat_id, schedule_function, *args, **kwargs):
+    """
+    Runs `schedule_function(*args, **kwargs)` in a thread, so the bot keeps
+    answering, and saves the resulting schedule.
+    """
+    try:
+        my_schedule = await asyncio.to_thread(schedule_function, *args, **kwargs)
+        moved, placed, skipped = save_schedule(my_schedule)
+    except Exception:
+        logger.exception("Couldn't compute the schedule")
+        await context.bot.send_message(
+            chat_id=chat_id,
+            text="No se pudo generar el cronograma :("
+        )
+        return
+    finally:
+        context.bot_data.pop(SCHEDULE_RUNNING, None)
+
+    text = "Cronograma Generado! ({} proyectos cambiaron de slot, {} proyectos nuevos)".format(
+        moved, placed)
+    if skipped:
+        text += ("\n{} asignaciones se descartaron porque el proyecto o el slot "
+                 "ya no existen.".format(skipped))
+    await context.bot.send_message(chat_id=chat_id, text=text)
+
 
 async def check_day_tab(slot, prev_slot, cronograma):
     def append_day_name():
@@ -214,7 +320,7 @@ async def borrar_cronograma_confirm(update, context):
     await callback_query.answer()
     chat_id = callback_query.message.chat_id
     username = callback_query.from_user.username
-    if username not in get_admins_username():
+    if not username_is_admin(username):
         await context.bot.send_message(
             chat_id=chat_id,
             text="No estas Autorizadx para hacer esta acción",
@@ -290,4 +396,5 @@ def set_handlers(application):
         )
     )
     application.add_handler(CommandHandler('cambiar_slot', change_slot))
+    application.add_handler(CommandHandler('recronogramear', reschedule))
     application.add_handler(load_schedule_handler)
@@ -1,3 +1,4 @@
+from bisect import bisect_right
 from collections import defaultdict
 from datetime import datetime, timedelta
 from itertools import cycle
@@ -10,7 +11,7 @@ from telegram.ext import CommandHandler
 from pycamp_bot.commands.auth import admin_needed
 from pycamp_bot.commands.manage_pycamp import get_active_pycamp
 from pycamp_bot.logger import logger
-from pycamp_bot.models import Pycampista, WizardAtPycamp
+from pycamp_bot.models import Pycampista, Slot, WizardAtPycamp
 from pycamp_bot.utils import escape_markdown, active_pycamp_needed
 
 
@@ -77,6 +78,53 @@ def compute_wizards_slots(pycamp):
     return slots
 
 
+class BusyIntervals:
+    """
+    Project presentation slots of a group of wizards, loaded with one query.
+
+    `is_busy(wizard, from_time, to_time)` answers like `Pycampista.is_busy`
+    with a bisect over the slots of the wizard sorted by start, and the
+    running maximum of their ends.
+    """
+
+    def __init__(self, wizards):
+        intervals = defaultdict(list)
+        # Slots whose start is stored as an hour, placed on the day of each query
+        self.hours = defaultdict(list)
+        slots = Slot.select(Slot.start, Slot.current_wizard).where(
+            Slot.current_wizard.in_([wizard.id for wizard in wizards])
+        )
+        for slot in slots:
+            if isinstance(slot.start, int):
+                self.hours[slot.current_wizard_id].append(slot.start)
+            else:
+                intervals[slot.current_wizard_id].append((slot.start, slot.get_end_time()))
+
+        self.starts = {}
+        self.max_ends = {}
+        for wizard_id, wizard_intervals in intervals.items():
+            wizard_intervals.sort()
+            self.starts[wizard_id] = [start for start, _ in wizard_intervals]
+            max_ends = []
+            for _, end in wizard_intervals:
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+            self.max_ends[wizard_id] = max_ends
+
+    def is_busy(self, wizard, from_time, to_time):
+        """`from_time, to_time` are two datetime objects."""
+        starts = self.starts.get(wizard.id, [])
+        # Slots starting until to_time overlap if any ends from from_time on
+        starting = bisect_right(starts, to_time)
+        if starting and self.max_ends[wizard.id][starting - 1] >= from_time:
+            return True
+
+        for hour in self.hours.get(wizard.id, []):
+            slot = Slot(start=from_time.replace(hour=hour))
+            if max(from_time, slot.start) <= min(to_time, slot.get_end_time()):
+                return True
+        return False
+
+
 def define_wizards_schedule(pycamp):
     """
     Returns a dict whose keys are times and values are wizards (Pycampistas instances).
@@ -86,14 +134,15 @@ def define_wizards_schedule(pycamp):
     if len(all_wizards) == 0:
         return {}
     
+    busy_intervals = BusyIntervals(all_wizards)
     wizard_per_slot = {}
     wizards_iter = cycle(all_wizards)
     for slot in compute_wizards_slots(pycamp):
         # Cycle through the wizards, asigning them to slots.
         wizard = next(wizards_iter)
-        if wizard.is_busy(*slot):
+        if busy_intervals.is_busy(wizard, *slot):
             # If the target wizard is busy in this time slot, try to find another available wizard
-            if all(w.is_busy(*slot) for w in all_wizards):
+            if all(busy_intervals.is_busy(w, *slot) for w in all_wizards):
                 # Nada que hacer, todos ocupados. Queda
                 logger.warning(
                     'Queda el magx {} con conflicto en el slot {}'.format(wizard.username, slot)
@@ -1 +1,4 @@
 SENTRY_DATA_SOURCE_NAME_ENVVAR = 'SENTRY_DATA_SOURCE_NAME'
+SCHEDULER_WORKERS_ENVVAR = 'PYCAMP_SCHEDULER_WORKERS'
+SCHEDULER_TIME_BUDGET_ENVVAR = 'PYCAMP_SCHEDULER_TIME_BUDGET'
+SCHEDULER_CACHE_DIR_ENVVAR = 'PYCAMP_SCHEDULER_CACHE_DIR'
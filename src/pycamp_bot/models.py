@@ -1,5 +1,6 @@
 import peewee as pw
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
 import datetime
 from zoneinfo import ZoneInfo
@@ -12,11 +13,41 @@ DEFAULT_SLOT_PERIOD = 60  # Minutos
 
 db = pw.SqliteDatabase('pycamp_projects.db')
 
+# Values read from the db and kept in memory by key, until a write invalidates them
+_cache = {}
+
+
+def cached(key, load):
+    """Return the value kept under `key`, loading it with `load()` the first time."""
+    if key not in _cache:
+        _cache[key] = load()
+    return _cache[key]
+
+
+def invalidate(keys=None):
+    """Drop the cached values of `keys`, or every cached value when `keys` is None."""
+    if keys is None:
+        _cache.clear()
+        return
+    for key in keys:
+        _cache.pop(key, None)
+
 
 class BaseModel(pw.Model):
+    # Cache keys derived from the rows of the model, dropped when one is written
+    cache_keys = ()
+
     class Meta:
         database = db
 
+    def save(self, *args, **kwargs):
+        invalidate(self.cache_keys)
+        return super().save(*args, **kwargs)
+
+    def delete_instance(self, *args, **kwargs):
+        invalidate(self.cache_keys)
+        return super().delete_instance(*args, **kwargs)
+
 
 class Pycampista(BaseModel):
     '''
@@ -33,7 +64,10 @@ class Pycampista(BaseModel):
     arrive = pw.DateTimeField(null=True)
     leave = pw.DateTimeField(null=True)
     wizard = pw.BooleanField(null=True)
-    admin = pw.BooleanField(null=True)
+    admin = pw.BooleanField(null=True, index=True)
+
+    # The wizard agendas hold Pycampista instances
+    cache_keys = ('admin_usernames', 'wizard_agendas')
 
     def __str__(self):
         rv_str = 'Pycampista:\n'
@@ -44,6 +78,14 @@ class Pycampista(BaseModel):
         rv_str += 'Admin' if self.admin else 'Commoner'
         return rv_str
 
+    @classmethod
+    def get_admin_usernames(cls):
+        """Return the set of admin usernames, kept in memory until a Pycampista is written."""
+        def load():
+            admins = cls.select(cls.username).where(cls.admin == True)
+            return frozenset(admin.username for admin in admins)
+        return cached('admin_usernames', load)
+
     def is_busy(self, from_time, to_time):
         """`from_time, to_time` are two datetime objects."""
         project_presentation_slots = Slot.select().where(Slot.current_wizard == self)
@@ -78,6 +120,8 @@ class Pycamp(BaseModel):
     active = pw.BooleanField(default=False, null=True)
     wizard_slot_duration = pw.IntegerField(default=60, null=False)  # In minutes
 
+    cache_keys = ('active_pycamp',)
+
     def __str__(self):
         rv_str = 'Pycamp:\n'
         for attr in ['headquarters', 'init', 'end', 'active',
@@ -85,6 +129,11 @@ class Pycamp(BaseModel):
             rv_str += f'{attr}: {getattr(self, attr)}\n'
         return rv_str
 
+    @classmethod
+    def get_active(cls):
+        """Return the active Pycamp or None, kept in memory until a Pycamp is written."""
+        return cached('active_pycamp', lambda: cls.select().where(cls.active).first())
+
     def set_as_only_active(self):
         active = list(Pycamp.select().where(Pycamp.active))
         for p in active:
@@ -102,31 +151,64 @@ class Pycamp(BaseModel):
         return pycampista
 
     def get_wizards(self):
-        pac = PycampistaAtPycamp.select().join(Pycampista).where(
+        pac = PycampistaAtPycamp.select(PycampistaAtPycamp, Pycampista).join(Pycampista).where(
             (PycampistaAtPycamp.pycamp == self) &
             (PycampistaAtPycamp.pycampista.wizard == True)
         )
         return [p.pycampista for p in pac]
 
+    def get_wizard_agenda(self):
+        """
+        Return the wizard agenda kept in memory, as (inits, max_ends, entries).
+
+        entries are the (init, end, wizard) turns sorted by init, and
+        max_ends[i] is the latest end of the first i + 1 turns.
+        """
+        agendas = cached('wizard_agendas', dict)  # By pycamp id
+        agenda = agendas.get(self.id)
+        if agenda is None:
+            turns = (
+                WizardAtPycamp
+                .select(WizardAtPycamp, Pycampista)
+                .join(Pycampista)
+                .where(WizardAtPycamp.pycamp == self)
+                .order_by(WizardAtPycamp.init)
+            )
+            entries = [(turn.init, turn.end, turn.wizard) for turn in turns]
+            max_ends = []
+            for _, end, _ in entries:
+                max_ends.append(max(end, max_ends[-1]) if max_ends else end)
+            agenda = ([init for init, _, _ in entries], max_ends, entries)
+            agendas[self.id] = agenda
+        return agenda
+
     def get_current_wizard(self):
         """Return the Pycampista instance that's the currently scheduled wizard."""
         now = datetime.datetime.now(ZoneInfo("America/Argentina/Cordoba"))
         logger.info("Request wizard at user time: %s", str(now))
-        current_wizards = WizardAtPycamp.select().where(
-            (WizardAtPycamp.pycamp == self) & 
-            (WizardAtPycamp.init <= now) &
-            (WizardAtPycamp.end > now) 
-        )
+        # The agenda is stored in local time
+        now = now.replace(tzinfo=None)
+        inits, max_ends, entries = self.get_wizard_agenda()
+
+        # Turns started by now, walking back while some of them could still go on
+        current_wizards = []
+        i = bisect_right(inits, now) - 1
+        while i >= 0 and max_ends[i] > now:
+            _, end, wizard = entries[i]
+            if end > now:
+                current_wizards.append(wizard)
+            i -= 1
 
         wizard = None  # Default if n_wiz == 0
-        if current_wizards.count() >= 1:
+        if current_wizards:
             # Ready for an improbable future where we'll have many concurrent wizards ;-)
-            wizard = choice(current_wizards).wizard
+            wizard = choice(current_wizards)
         
         return wizard
 
 
     def clear_wizards_schedule(self):
+        invalidate(WizardAtPycamp.cache_keys)
         return WizardAtPycamp.delete().where(WizardAtPycamp.pycamp == self).execute()
 
 class PycampistaAtPycamp(BaseModel):
@@ -148,6 +230,14 @@ class WizardAtPycamp(BaseModel):
     init = pw.DateTimeField()
     end = pw.DateTimeField()
 
+    class Meta:
+        indexes = (
+            (('pycamp', 'init', 'end'), False),  # Current wizard lookups
+            (('pycamp', 'wizard'), False),  # Agenda of a wizard
+        )
+
+    cache_keys = ('wizard_agendas',)
+
 
 class Slot(BaseModel):
     '''
@@ -156,7 +246,7 @@ class Slot(BaseModel):
     represents the day and the number the position of the slot that day.
     start: Time of start of the slot
     '''
-    code = pw.CharField()  # For example A1 for first slot first day
+    code = pw.CharField(index=True)  # For example A1 for first slot first day
     start = pw.DateTimeField()
     current_wizard = pw.ForeignKeyField(Pycampista, null=True)
 
@@ -199,6 +289,12 @@ class Vote(BaseModel):
     # same project
     _project_pycampista_id = pw.CharField(unique=True)
 
+    class Meta:
+        indexes = (
+            (('project', 'interest'), False),  # Interested people of a project
+            (('pycampista', 'interest'), False),  # Projects someone is interested in
+        )
+
 
 def models_db_connection():
     db.connect()
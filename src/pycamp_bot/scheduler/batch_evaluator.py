@@ -0,0 +1,164 @@
+"""
+NumPy evaluation of whole batches of moves of the schedule calculator.
+
+Needs the optional numpy dependency (``pip install PyCamp_Bot[numpy]``).
+"""
+try:
+    import numpy as np
+except ImportError as error:  # pragma: no cover
+    raise ImportError('The batch evaluator needs numpy: pip install PyCamp_Bot[numpy]') from error
+
+from pycamp_bot.scheduler.schedule_calculator import ScheduleEvaluator
+
+# Deltas below this are float noise, not improvements
+IMPROVEMENT_TOLERANCE = 1e-6
+
+
+class BatchScheduleEvaluator(ScheduleEvaluator):
+    '''
+    ScheduleEvaluator that scores batches of moves with NumPy.
+
+    Besides the slots of each project it keeps `slot_pair_costs`, the
+    (projects x slots) matrix with the pair cost of each project against the
+    projects of each slot, so the deltas of every move and swap of the
+    neighbourhood come from a few array operations. Every project must be
+    assigned to a slot.
+    '''
+    def __init__(self, problem, state):
+        self.pair_costs = np.array(problem.pair_costs, dtype=float).reshape(
+            len(problem.project_list), len(problem.project_list))
+        self.project_costs = np.array(problem.project_costs, dtype=float).reshape(
+            len(problem.project_list), len(problem.slot_list))
+        self.votes = np.array(problem.votes_counts, dtype=float)
+        self.slot_pair_costs = np.zeros_like(self.project_costs)
+        super().__init__(problem, state)
+        self.value = float(self.value)
+
+    def _place(self, i, slot):
+        super()._place(i, slot)
+        self.slot_pair_costs[:, slot] += self.pair_costs[:, i]
+
+    def _remove(self, i):
+        self.slot_pair_costs[:, self.assignment[i]] -= self.pair_costs[:, i]
+        super()._remove(i)
+
+    def _slot_costs(self, slot, quantity, votes):
+        '''PyCampScheduleProblem.slot_cost() over arrays'''
+        problem = self.problem
+        denom = max(1, problem.total_participants)
+        slot_population_cost = np.power(3.0, quantity) + slot * quantity
+        most_voted_cost = (slot * votes) / denom
+        return (slot_population_cost * problem.slot_population_weight +
+                most_voted_cost * problem.most_voted_weight)
+
+    def _current(self):
+        '''Arrays with the slot of each project and the population and votes of each slot'''
+        assignment = np.array(self.assignment)
+        quantities = np.array([len(projects) for projects in self.slot_projects], dtype=float)
+        slot_votes = np.array(self.slot_votes, dtype=float)
+        return assignment, quantities, slot_votes
+
+    def _move_costs(self, i, slot, current):
+        '''Cost change of moving the projects `i` to `slot`, broadcasting both'''
+        assignment, quantities, slot_votes = current
+        current_slot = assignment[i]
+        votes = self.votes[i]
+        return (
+            self.slot_pair_costs[i, slot] - self.slot_pair_costs[i, current_slot] +
+            self._slot_costs(current_slot, quantities[current_slot] - 1,
+                             slot_votes[current_slot] - votes) -
+            self._slot_costs(current_slot, quantities[current_slot], slot_votes[current_slot]) +
+            self._slot_costs(slot, quantities[slot] + 1, slot_votes[slot] + votes) -
+            self._slot_costs(slot, quantities[slot], slot_votes[slot]) +
+            self.project_costs[i, slot] - self.project_costs[i, current_slot]
+        )
+
+    def _swap_half_costs(self, i, j, current):
+        '''
+        Cost change on the side of the projects `i` when swapping them with
+        `j`, broadcasting both. A swap costs the sum of both sides.
+        '''
+        assignment, quantities, slot_votes = current
+        slot1 = assignment[i]
+        slot2 = assignment[j]
+        return (
+            self.slot_pair_costs[i, slot2] - self.pair_costs[i, j] -
+            self.slot_pair_costs[i, slot1] +
+            self._slot_costs(slot1, quantities[slot1],
+                             slot_votes[slot1] - self.votes[i] + self.votes[j]) -
+            self._slot_costs(slot1, quantities[slot1], slot_votes[slot1]) +
+            self.project_costs[i, slot2] - self.project_costs[i, slot1]
+        )
+
+    def batch_deltas(self, moves):
+        '''Returns the value changes of a batch of moves, as a NumPy array'''
+        deltas = np.zeros(len(moves))
+        if not moves:
+            return deltas
+
+        current = self._current()
+        assignment = current[0]
+        kinds, projects, targets = zip(*moves)
+        is_swap = np.array(kinds) == 'swap'
+        is_move = ~is_swap
+        projects = np.array(projects)
+        targets = np.array(targets)
+
+        i, slot = projects[is_move], targets[is_move]
+        deltas[is_move] = -self._move_costs(i, slot, current)
+        i, j = projects[is_swap], targets[is_swap]
+        deltas[is_swap] = -(self._swap_half_costs(i, j, current) +
+                            self._swap_half_costs(j, i, current))
+
+        # Moves that don't change the state, like in move_delta() and swap_delta()
+        target_slots = targets.copy()
+        target_slots[is_swap] = assignment[j]
+        deltas[assignment[projects] == target_slots] = 0
+
+        self.problem.evaluations += len(moves)
+        return deltas
+
+    def neighbour_deltas(self):
+        '''
+        Returns the (projects x slots) deltas of every move and the (projects x
+        projects) deltas of every swap, with -inf for moves that don't change
+        the state and for repeated swaps.
+        '''
+        current = self._current()
+        assignment = current[0]
+        projects = np.arange(len(assignment))[:, np.newaxis]
+        slots = np.arange(len(self.slot_projects))[np.newaxis, :]
+
+        move_deltas = -self._move_costs(projects, slots, current)
+        move_deltas[projects[:, 0], assignment] = -np.inf
+
+        half_costs = self._swap_half_costs(projects, projects.T, current)
+        swap_deltas = -(half_costs + half_costs.T)
+        same_slot = assignment[:, np.newaxis] == assignment[np.newaxis, :]
+        swap_deltas[same_slot | (projects >= projects.T)] = -np.inf
+        if self.problem.components is not None:
+            component_of = np.array(self.problem.component_of)
+            swap_deltas[component_of[:, np.newaxis] != component_of[np.newaxis, :]] = -np.inf
+
+        self.problem.evaluations += (np.count_nonzero(move_deltas > -np.inf) +
+                                     np.count_nonzero(swap_deltas > -np.inf))
+        return move_deltas, swap_deltas
+
+    def best_move(self):
+        '''Returns the (move, delta) that improves the state the most, or (None, 0)'''
+        move_deltas, swap_deltas = self.neighbour_deltas()
+        best_move = None
+        best_delta = IMPROVEMENT_TOLERANCE
+        if move_deltas.size:
+            i, slot = np.unravel_index(np.argmax(move_deltas), move_deltas.shape)
+            if move_deltas[i, slot] > best_delta:
+                best_move = ('move', int(i), int(slot))
+                best_delta = move_deltas[i, slot]
+        if swap_deltas.size:
+            i, j = np.unravel_index(np.argmax(swap_deltas), swap_deltas.shape)
+            if swap_deltas[i, j] > best_delta:
+                best_move = ('swap', int(i), int(j))
+                best_delta = swap_deltas[i, j]
+        if best_move is None:
+            return None, 0
+        return best_move, float(best_delta)
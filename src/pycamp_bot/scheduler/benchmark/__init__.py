@@ -0,0 +1,6 @@
+"""
+Benchmarks for the schedule calculator: synthetic instances in the
+export_db_2_json format and a runner that measures each solver on them.
+
+Run it with `python -m pycamp_bot.scheduler.benchmark --help`.
+"""
@@ -0,0 +1,64 @@
+import argparse
+import json
+import sys
+
+from pycamp_bot.scheduler.benchmark.generator import REFERENCE_INSTANCES, reference_instance
+from pycamp_bot.scheduler.benchmark.runner import compare, run_benchmark
+from pycamp_bot.scheduler.schedule_calculator import SOLVERS
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the schedule calculator solvers. Prints one JSON result per line.')
+    parser.add_argument('--instances', nargs='+', choices=sorted(REFERENCE_INSTANCES),
+                        default=['small', 'medium', 'large'],
+                        help='Reference instances to solve.')
+    parser.add_argument('--solvers', nargs='+', choices=sorted(SOLVERS), default=sorted(SOLVERS),
+                        help='Solvers to measure.')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1, 2],
+                        help='Seeds for each solver run.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes for each run.')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Seconds for each run.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help="Don't measure peak memory (saves a second run).")
+    parser.add_argument('--output', help='Write all the results to this JSON file.')
+    parser.add_argument('--baseline', help='JSON file of a previous run to compare with.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Relative worsening allowed against the baseline.')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    options = {}
+    if args.time_budget is not None:
+        options['time_budget'] = args.time_budget
+
+    results = []
+    for instance in args.instances:
+        data = reference_instance(instance)
+        for solver in args.solvers:
+            for seed in args.seeds:
+                result = dict(instance=instance, **run_benchmark(
+                    data, solver, seed=seed, workers=args.workers,
+                    measure_memory=not args.no_memory, **options))
+                results.append(result)
+                print(json.dumps(result), flush=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION', regression, file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
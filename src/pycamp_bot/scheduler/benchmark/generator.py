@@ -0,0 +1,61 @@
+"""Synthetic scheduling instances, in the format returned by export_db_2_json."""
+import random
+import string
+
+
+THEMES = ['web', 'data', 'ml', 'desktop', 'mobile', 'hardware', 'games', 'tooling']
+
+# Fixed-seed instances used to compare solvers and catch regressions
+REFERENCE_INSTANCES = {
+    'small': dict(projects=18, voters=40, slots=11, vote_density=0.15,
+                  responsables=14, seed=1),
+    'medium': dict(projects=40, voters=100, slots=15, vote_density=0.10,
+                   responsables=30, seed=2),
+    'large': dict(projects=60, voters=150, slots=15, vote_density=0.10,
+                  responsables=45, seed=3),
+    'huge': dict(projects=100, voters=500, slots=20, vote_density=0.05,
+                 responsables=80, seed=4),
+}
+
+
+def slot_codes(slots, slots_per_day=5):
+    '''Slot codes like the bot creates them: A1, A2, ... B1, B2, ...'''
+    return ['{}{}'.format(string.ascii_uppercase[i // slots_per_day], i % slots_per_day + 1)
+            for i in range(slots)]
+
+
+def generate_instance(projects=30, voters=80, slots=12, vote_density=0.1,
+                      responsables=None, seed=0):
+    '''
+    Returns a random instance with the given number of projects, voters and
+    slots. Each voter is interested in each project with probability
+    `vote_density`, and every project is owned by one of `responsables`
+    pycampistas (by default, half the number of projects).
+    '''
+    rng = random.Random(seed)
+    if responsables is None:
+        responsables = max(1, projects // 2)
+
+    available_slots = slot_codes(slots)
+    voter_names = ['voter{:04d}'.format(i) for i in range(voters)]
+    responsable_names = ['owner{:04d}'.format(i) for i in range(responsables)]
+
+    result = {"projects": {}, "responsable_available_slots": {},
+              "available_slots": available_slots}
+    for number in range(projects):
+        owner = rng.choice(responsable_names)
+        votes = [voter for voter in voter_names if rng.random() < vote_density]
+        result["projects"]['project{:04d}'.format(number)] = {
+            "priority_slots": [],
+            "difficult_level": rng.randint(1, 3),
+            "responsables": [owner],
+            "votes": votes,
+            "theme": rng.choice(THEMES),
+        }
+        result["responsable_available_slots"][owner] = available_slots
+
+    return result
+
+
+def reference_instance(name):
+    return generate_instance(**REFERENCE_INSTANCES[name])
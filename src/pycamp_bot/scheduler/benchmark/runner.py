@@ -0,0 +1,78 @@
+"""Measures the solvers of the schedule calculator on benchmark instances."""
+import time
+import tracemalloc
+
+from pycamp_bot.scheduler.schedule_calculator import PyCampScheduleProblem, solve
+
+
+def _solve(data, solver, seed, workers, options):
+    problem = PyCampScheduleProblem(data)
+    state = solve(problem, solver=solver, workers=workers, seed=seed, **options)
+    return problem, state
+
+
+def run_benchmark(data, solver, seed=0, workers=1, measure_memory=True, **options):
+    '''
+    Solves the instance and returns a dict with the wall time, evaluations
+    per second, peak memory (bytes allocated by Python, measured on a second
+    run because tracing slows the solver down) and final cost.
+
+    Evaluations done in worker processes are not counted, so compare
+    throughput with `workers=1`.
+    '''
+    start = time.perf_counter()
+    problem, state = _solve(data, solver, seed, workers, options)
+    wall_time = time.perf_counter() - start
+    evaluations = problem.evaluations
+    value = problem.value(state)
+
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            _solve(data, solver, seed, workers, options)
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "solver": solver,
+        "seed": seed,
+        "workers": workers,
+        "options": options,
+        "projects": len(problem.project_list),
+        "slots": len(problem.slot_list),
+        "voters": problem.total_participants,
+        "wall_time": wall_time,
+        "evaluations": evaluations,
+        "evaluations_per_second": evaluations / wall_time if wall_time > 0 else None,
+        "peak_memory": peak_memory,
+        "cost": -value,
+    }
+
+
+def result_key(result):
+    return (result["instance"], result["solver"], result["seed"])
+
+
+def compare(results, baseline, tolerance=0.1):
+    '''
+    Returns a message for each result whose cost or evaluations per second
+    got worse than the matching baseline result by more than `tolerance`.
+    '''
+    baseline = {result_key(result): result for result in baseline}
+    regressions = []
+    for result in results:
+        reference = baseline.get(result_key(result))
+        if reference is None:
+            continue
+        name = '{} / {} / seed {}'.format(*result_key(result))
+        if result["cost"] > reference["cost"] + tolerance * abs(reference["cost"]):
+            regressions.append('{}: cost {:.2f} (baseline {:.2f})'.format(
+                name, result["cost"], reference["cost"]))
+        speed = result["evaluations_per_second"]
+        reference_speed = reference["evaluations_per_second"]
+        if speed and reference_speed and speed < (1 - tolerance) * reference_speed:
+            regressions.append('{}: {:.0f} evaluations/s (baseline {:.0f})'.format(
+                name, speed, reference_speed))
+    return regressions
@@ -0,0 +1,95 @@
+"""
+On-disk cache of solved schedules.
+
+Entries are addressed by the sha256 of the canonical form of the problem and
+the solver parameters, so an identical request is answered without solving
+it again. When the cache is full the least recently used entry is evicted.
+"""
+import hashlib
+import json
+import os
+
+from pycamp_bot.constants import SCHEDULER_CACHE_DIR_ENVVAR
+from pycamp_bot.logger import logger
+
+DEFAULT_CACHE_DIR = '.schedule_cache'
+DEFAULT_MAX_ENTRIES = 100
+
+
+def schedule_key(problem, solver, seed, options):
+    """Content address of the schedule of `problem` solved with these parameters."""
+    content = {
+        'problem': problem.canonical(),
+        'solver': solver,
+        'seed': seed,
+        'options': options,
+    }
+    canonical_json = json.dumps(content, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical_json.encode('utf-8')).hexdigest()
+
+
+class ScheduleCache:
+    """Solved states stored as one JSON file per key, evicted by last use."""
+
+    def __init__(self, directory, max_entries=DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key):
+        """Returns the cached state for the key, or None."""
+        path = self._path(key)
+        try:
+            with open(path) as cache_file:
+                state = [tuple(assignment) for assignment in json.load(cache_file)]
+        except (OSError, ValueError):
+            self.misses += 1
+            logger.info('Schedule cache miss %s (%d hits, %d misses)',
+                        key[:12], self.hits, self.misses)
+            return None
+
+        # Mark the entry as recently used
+        os.utime(path)
+        self.hits += 1
+        logger.info('Schedule cache hit %s (%d hits, %d misses)',
+                    key[:12], self.hits, self.misses)
+        return state
+
+    def put(self, key, state):
+        """Stores the state for the key. A cache that can't be written is skipped."""
+        path = self._path(key)
+        temporary_path = path + '.tmp'
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporary_path, 'w') as cache_file:
+                json.dump(state, cache_file)
+            os.replace(temporary_path, path)
+            self.evict()
+        except OSError as error:
+            logger.warning('Could not write the schedule cache %s: %s', key[:12], error)
+        return state
+
+    def evict(self):
+        """Removes the least recently used entries beyond max_entries."""
+        entries = [entry for entry in os.scandir(self.directory)
+                   if entry.name.endswith('.json')]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            os.remove(entry.path)
+
+
+_caches = {}
+
+
+def default_cache():
+    """Cache in PYCAMP_SCHEDULER_CACHE_DIR, shared by the calls of this process."""
+    directory = os.environ.get(SCHEDULER_CACHE_DIR_ENVVAR) or DEFAULT_CACHE_DIR
+    if directory not in _caches:
+        _caches[directory] = ScheduleCache(directory)
+    return _caches[directory]
@@ -1,34 +1,142 @@
-import json
-from pycamp_bot.models import Project, Slot, Vote
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from pycamp_bot.models import DEFAULT_SLOT_PERIOD, Project, Pycamp, Pycampista, Slot, Vote
+from pycamp_bot.scheduler.schedule_calculator import ProjectSpec, PyCampScheduleProblem
+
+
+def _slot_starts():
+    """
+    (code, start) of every slot, with start as a datetime or None if unknown.
+
+    Slots loaded with /cronogramear only store the hour, so their day is the
+    letter of the code counted from the init of the active PyCamp. The PyCamp
+    is only queried when there are such slots.
+    """
+    slots = list(Slot.select(Slot.code, Slot.start).tuples())
+    pycamp_init = None
+    if any(isinstance(start, int) for _, start in slots):
+        pycamp_init = Pycamp.select(Pycamp.init).where(Pycamp.active).scalar()
+
+    slot_starts = []
+    for code, start in slots:
+        if isinstance(start, int):
+            if pycamp_init is None:
+                start = None
+            else:
+                day = pycamp_init.date() + timedelta(days=ord(code[0]) - ord('A'))
+                start = datetime.combine(day, datetime.min.time()).replace(hour=start)
+        slot_starts.append((code, start))
+    return slot_starts
+
+
+def _available_slots(arrive, leave, slot_starts):
+    """Codes of the slots that fit between `arrive` and `leave`, both optional."""
+    period = timedelta(minutes=DEFAULT_SLOT_PERIOD)
+    return [
+        code for code, start in slot_starts
+        if start is None or (
+            (arrive is None or arrive <= start) and
+            (leave is None or start + period <= leave)
+        )
+    ]
+
+
+def _project_rows():
+    """
+    (id, name, difficult_level, topic, owner username, owner arrive, owner
+    leave) of every project.
+    """
+    return (
+        Project
+        .select(Project.id, Project.name, Project.difficult_level, Project.topic,
+                Pycampista.username, Pycampista.arrive, Pycampista.leave)
+        .join(Pycampista, on=(Project.owner == Pycampista.id))
+        .tuples()
+        .iterator()
+    )
+
+
+def _vote_rows():
+    """(project id, voter username) of every interested vote."""
+    return (
+        Vote
+        .select(Vote.project, Pycampista.username)
+        .join(Pycampista, on=(Vote.pycampista == Pycampista.id))
+        .where(Vote.interest)
+        .distinct()
+        .tuples()
+        .iterator()
+    )
 
 
 def export_db_2_json():
-    projects = Project.select()
+    """
+    Exports the projects, votes and slots in the input format of the scheduler.
 
+    Runs three queries (slots, projects with their owners and interested votes
+    with their voters), plus one for the active PyCamp when slots only store
+    their hour, and iterates them as tuples, without building models. Owners
+    are available in the slots between their arrive and leave times.
+    """
     result = {"projects": {}, "responsable_available_slots": {}}
 
-    available_slots = [slot.code for slot in Slot.select()]
-
-    result["available_slots"] = available_slots
-    all_responsables = []
+    slot_starts = _slot_starts()
+    result["available_slots"] = [code for code, _ in slot_starts]
 
-    for project in projects:
-        votes = list(Vote.select().where(Vote.project == project, Vote.interest))
-        # responsables = list(ProjectOwner.select().where(ProjectOwner.project == project))
-        # responsables = [responsable.username for responsable in responsables]
-        responsables = [project.owner.username]
-        if project.owner.username not in all_responsables:
-            all_responsables.append(project.owner.username)
-        votes_users = set([v.pycampista.username for v in votes])
-        result["projects"][project.name] = {
+    projects_by_id = {}
+    for project_id, name, difficult_level, topic, owner, arrive, leave in _project_rows():
+        project = {
             "priority_slots": [],
-            "difficult_level": project.difficult_level,
-            "responsables": responsables,
-            "votes": list(votes_users),
-            "theme": project.topic,
+            "difficult_level": difficult_level,
+            "responsables": [owner],
+            "votes": [],
+            "theme": topic,
         }
+        result["projects"][name] = project
+        projects_by_id[project_id] = project
+        if owner not in result["responsable_available_slots"]:
+            result["responsable_available_slots"][owner] = _available_slots(
+                arrive, leave, slot_starts)
 
-    for responsable in all_responsables:
-        result["responsable_available_slots"][responsable] = available_slots
+    for project_id, username in _vote_rows():
+        projects_by_id[project_id]["votes"].append(username)
 
     return result
+
+
+def export_current_schedule():
+    """(project name, slot code) of every project that already has a slot."""
+    return list(
+        Project
+        .select(Project.name, Slot.code)
+        .join(Slot, on=(Project.slot == Slot.id))
+        .tuples()
+    )
+
+
+def build_schedule_problem(**weights):
+    """
+    Builds the PyCampScheduleProblem straight from the database rows, with the
+    same queries as export_db_2_json but without the JSON intermediate.
+    """
+    votes = defaultdict(list)
+    for project_id, username in _vote_rows():
+        votes[project_id].append(username)
+
+    slot_starts = _slot_starts()
+    projects = []
+    responsable_available_slots = {}
+    for project_id, name, difficult_level, topic, owner, arrive, leave in _project_rows():
+        projects.append(ProjectSpec(
+            name=name,
+            responsables=(owner,),
+            votes=tuple(votes[project_id]),
+            difficult_level=difficult_level,
+            theme=topic,
+        ))
+        if owner not in responsable_available_slots:
+            responsable_available_slots[owner] = _available_slots(arrive, leave, slot_starts)
+
+    return PyCampScheduleProblem.from_specs(
+        projects, [code for code, _ in slot_starts], responsable_available_slots, **weights)
@@ -0,0 +1,158 @@
+"""
+Profiling of the schedule calculator: how much each cost term adds to the
+objective and takes to compute, evaluations per second and the size of the
+neighbourhood scored at each hill climbing step.
+"""
+import time
+from itertools import combinations
+
+from pycamp_bot.scheduler.schedule_calculator import DEFAULT_SOLVER, IMPOSIBLE_COST, solve
+
+
+def _pairs(problem, slots):
+    return (pair for slot_projects in slots for pair in combinations(slot_projects, 2))
+
+
+def responsables_collisions(problem, slots, assignment):
+    return sum(IMPOSIBLE_COST * problem.responsables_collisions_weight
+               for i, j in _pairs(problem, slots) if problem.responsables_conflict[i][j])
+
+
+def participant_collisions(problem, slots, assignment):
+    return sum(problem.voters_overlap[i][j] * problem.participant_collisions_weight
+               for i, j in _pairs(problem, slots))
+
+
+def slot_population(problem, slots, assignment):
+    return sum(((3 ** len(slot_projects)) + slot_number * len(slot_projects)) *
+               problem.slot_population_weight
+               for slot_number, slot_projects in enumerate(slots))
+
+
+def most_voted(problem, slots, assignment):
+    denom = max(1, problem.total_participants)
+    return sum(slot_number * sum(problem.votes_counts[i] for i in slot_projects) / denom *
+               problem.most_voted_weight
+               for slot_number, slot_projects in enumerate(slots))
+
+
+def same_levels(problem, slots, assignment):
+    return sum(problem.same_levels_weight
+               for i, j in _pairs(problem, slots) if problem.same_level[i][j])
+
+
+def same_themes(problem, slots, assignment):
+    return sum(problem.same_theme_weight
+               for i, j in _pairs(problem, slots) if problem.same_theme[i][j])
+
+
+def responsable_not_available(problem, slots, assignment):
+    cost = 0
+    for i, slot_number in assignment:
+        for resp in problem.projects[i].responsables:
+            available_mask = problem.responsable_available_masks.get(resp)
+            if available_mask is not None and not available_mask & (1 << slot_number):
+                cost += IMPOSIBLE_COST * problem.responsable_not_available_weight
+    return cost
+
+
+def not_in_priority_slot(problem, slots, assignment):
+    cost = 0
+    for i, slot_number in assignment:
+        priority_slots = problem.projects[i].priority_slots
+        if priority_slots and problem.slot_list[slot_number] not in priority_slots:
+            cost += 10 * problem.project_not_in_priority_slot_weight
+    return cost
+
+
+# Cost terms of PyCampScheduleProblem.value(), each computed on its own
+COST_TERMS = {
+    'responsables_collisions': responsables_collisions,
+    'participant_collisions': participant_collisions,
+    'slot_population': slot_population,
+    'most_voted': most_voted,
+    'same_levels': same_levels,
+    'same_themes': same_themes,
+    'responsable_not_available': responsable_not_available,
+    'not_in_priority_slot': not_in_priority_slot,
+}
+
+
+def _indexed(problem, state):
+    slots = problem.slots_and_projects(state)
+    assignment = [(problem.project_index[project], problem.slot_index[slot])
+                  for project, slot in state]
+    return slots, assignment
+
+
+def cost_breakdown(problem, state):
+    '''Returns the weighted cost each term adds to the state, they add up to -value(state)'''
+    slots, assignment = _indexed(problem, state)
+    return {name: term(problem, slots, assignment) for name, term in COST_TERMS.items()}
+
+
+def time_terms(problem, state, repeats=100):
+    '''Returns the seconds taken to compute each term of the state `repeats` times'''
+    slots, assignment = _indexed(problem, state)
+    times = {}
+    for name, term in COST_TERMS.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            term(problem, slots, assignment)
+        times[name] = time.perf_counter() - start
+    return times
+
+
+def profile(problem, solver=DEFAULT_SOLVER, seed=None, repeats=100, **options):
+    '''
+    Solves the problem in this process and returns the schedule with a
+    report of the solve: elapsed time, evaluations, evaluations per second,
+    neighbourhood size of each hill climbing step, and the cost and time
+    of each term on the schedule.
+
+    The solvers add the terms up front in the pair and project cost
+    matrices, so term times measure each term computed on its own over
+    `repeats` evaluations of the schedule.
+    '''
+    problem.neighbourhood_sizes = []
+    evaluations = problem.evaluations
+    start = time.perf_counter()
+    state = solve(problem, solver=solver, workers=1, seed=seed, **options)
+    elapsed = time.perf_counter() - start
+    evaluations = problem.evaluations - evaluations
+    neighbourhood_sizes = problem.neighbourhood_sizes
+    problem.neighbourhood_sizes = None
+
+    costs = cost_breakdown(problem, state)
+    times = time_terms(problem, state, repeats)
+    report = {
+        'solver': solver,
+        'elapsed': elapsed,
+        'evaluations': evaluations,
+        'evaluations_per_second': evaluations / elapsed if elapsed > 0 else None,
+        'neighbourhood_sizes': neighbourhood_sizes,
+        'terms': {name: {'cost': costs[name], 'time': times[name]} for name in COST_TERMS},
+    }
+    return state, report
+
+
+def format_report(report):
+    '''Text table of a profile() report'''
+    total_cost = sum(term['cost'] for term in report['terms'].values())
+    total_time = sum(term['time'] for term in report['terms'].values())
+    lines = [
+        'Solver {}: {:.2f}s, {} evaluations ({:.0f}/s)'.format(
+            report['solver'], report['elapsed'], report['evaluations'],
+            report['evaluations_per_second'] or 0),
+    ]
+    sizes = report['neighbourhood_sizes']
+    if sizes:
+        lines.append('Neighbourhood: {} steps, {:.0f} neighboors per step (min {}, max {})'.format(
+            len(sizes), sum(sizes) / len(sizes), min(sizes), max(sizes)))
+    lines.append('{:26s} {:>14s} {:>7s} {:>9s} {:>7s}'.format(
+        'Term', 'Cost', '%', 'Time (s)', '%'))
+    for name, term in report['terms'].items():
+        lines.append('{:26s} {:14.2f} {:6.1f}% {:9.4f} {:6.1f}%'.format(
+            name, term['cost'], 100 * term['cost'] / total_cost if total_cost else 0,
+            term['time'], 100 * term['time'] / total_time if total_time else 0))
+    return '\n'.join(lines)
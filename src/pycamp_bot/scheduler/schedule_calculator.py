@@ -4,15 +4,29 @@ Algorithm to create s schedule based on users votes.
 Author: Ariel Rossanigo
 Original repo for this script: https://github.com/arielrossanigo/pycamp_scheduling
 """
+import argparse
 import json
+import math
+import multiprocessing
+import os
 import random
-import sys
-from collections import OrderedDict
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
 from operator import itemgetter
+from typing import NamedTuple
+
 from munch import munchify
 
+from pycamp_bot.constants import SCHEDULER_TIME_BUDGET_ENVVAR, SCHEDULER_WORKERS_ENVVAR
+from pycamp_bot.scheduler.cache import default_cache, schedule_key
+
 IMPOSIBLE_COST = 1000000
+INITIAL_STATES = ('random', 'dsatur')
+DEFAULT_TIME_BUDGET = 60  # Seconds
+DEFAULT_MEMO_SIZE = 10000  # States whose value is memoized by enable_memo()
+MOVED_PROJECT_COST = 10  # Cost of moving a scheduled project when rescheduling
 
 
 def schedule(data):
@@ -22,17 +36,22 @@ def schedule(data):
     return best_solution
 
 
-class PyCampScheduleProblem:
-    def __init__(self, data,
-                 responsables_collisions_weight=1.0,
-                 participant_collisions_weight=1.0,
-                 responsable_not_available_weight=1.0,
-                 most_voted_weight=1.0,
-                 slot_population_weight=1.0,
-                 project_not_in_priority_slot_weight=1.0,
-                 same_levels_weight=1.0,
-                 same_theme_weight=1.0):
+class ProjectSpec(NamedTuple):
+    '''Scheduling data of a project, as loaded from the database or the JSON input'''
+    name: str
+    responsables: tuple[str, ...]
+    votes: tuple[str, ...]
+    difficult_level: int
+    theme: str | None
+    priority_slots: tuple[str, ...] = ()
 
+
+class PyCampScheduleProblem:
+    def __init__(self, data, **weights):
+        '''
+        Builds the problem from the JSON input of the CLI, in the format of
+        export_db_2_json. `weights` are the cost weights accepted by setup().
+        '''
         self.data = munchify(data)
 
         # force project responsables to be on their project votes list
@@ -41,6 +60,42 @@ class PyCampScheduleProblem:
                 if resp not in self.data.projects[project].votes:
                     self.data.projects[project].votes.append(resp)
 
+        projects = [
+            ProjectSpec(
+                name=name,
+                responsables=tuple(project.responsables),
+                votes=tuple(project.votes),
+                difficult_level=project.difficult_level,
+                theme=project.theme,
+                priority_slots=tuple(project.priority_slots),
+            )
+            for name, project in self.data.projects.items()
+        ]
+        self.setup(projects, self.data.available_slots,
+                   self.data.responsable_available_slots, **weights)
+
+    @classmethod
+    def from_specs(cls, projects, available_slots, responsable_available_slots=None, **weights):
+        '''
+        Builds the problem straight from a list of ProjectSpec and the slot
+        codes, skipping the JSON input. Responsables missing from
+        `responsable_available_slots` are available in every slot.
+        '''
+        problem = cls.__new__(cls)
+        problem.data = None
+        problem.setup(projects, available_slots, responsable_available_slots or {}, **weights)
+        return problem
+
+    def setup(self, projects, available_slots, responsable_available_slots,
+              responsables_collisions_weight=1.0,
+              participant_collisions_weight=1.0,
+              responsable_not_available_weight=1.0,
+              most_voted_weight=1.0,
+              slot_population_weight=1.0,
+              project_not_in_priority_slot_weight=1.0,
+              same_levels_weight=1.0,
+              same_theme_weight=1.0):
+        '''Builds the indexed representation used by the solvers'''
         self.responsables_collisions_weight = responsables_collisions_weight
         self.participant_collisions_weight = participant_collisions_weight
         self.responsable_not_available_weight = responsable_not_available_weight
@@ -50,16 +105,171 @@ class PyCampScheduleProblem:
         self.same_levels_weight = same_levels_weight
         self.same_theme_weight = same_theme_weight
 
-        self.project_list = list(self.data.projects.keys())
-        self.total_participants = len(set([vote
-                                           for pr in self.data.projects.values()
-                                           for vote in pr.votes]))
+        # force project responsables to be on their project votes list
+        self.projects = [
+            project._replace(votes=project.votes + tuple(
+                resp for resp in project.responsables if resp not in project.votes))
+            for project in projects
+        ]
+
+        self.project_list = [project.name for project in self.projects]
+        self.slot_list = list(available_slots)
+        self.project_index = {project: i for i, project in enumerate(self.project_list)}
+        self.slot_index = {slot: i for i, slot in enumerate(self.slot_list)}
+
+        # Slots where each responsable is available, as bitmasks by slot position
+        self.responsable_available_masks = {
+            resp: self._slot_mask(slots) for resp, slots in responsable_available_slots.items()}
+
+        projects = self.projects
+        # Voters and responsables of each project as bitmasks, one bit per person
+        voter_bits = {}
+        self.voter_masks = [self._mask(project.votes, voter_bits) for project in projects]
+        responsable_bits = {}
+        responsable_masks = [self._mask(project.responsables, responsable_bits)
+                             for project in projects]
+        self.total_participants = len(voter_bits)
+        self.votes_counts = [mask.bit_count() for mask in self.voter_masks]
+
+        # Pair matrices indexed by project position, the diagonal is always empty
+        indexes = range(len(projects))
+        self.voters_overlap = [[0] * len(projects) for _ in indexes]
+        self.responsables_conflict = [[False] * len(projects) for _ in indexes]
+        for i, j in combinations(indexes, 2):
+            overlap = (self.voter_masks[i] & self.voter_masks[j]).bit_count()
+            self.voters_overlap[i][j] = self.voters_overlap[j][i] = overlap
+            conflict = (responsable_masks[i] & responsable_masks[j]) != 0
+            self.responsables_conflict[i][j] = self.responsables_conflict[j][i] = conflict
+        self.same_level = [[i != j and projects[i].difficult_level == projects[j].difficult_level
+                            for j in indexes] for i in indexes]
+        self.same_theme = [[i != j and projects[i].theme == projects[j].theme
+                            for j in indexes] for i in indexes]
+        self.pair_costs = [[self._pair_cost(i, j) for j in indexes] for i in indexes]
+
+        # Cost of placing each project (row) in each slot (column)
+        self.project_costs = [[self._project_cost(project, slot_number)
+                               for slot_number in range(len(self.slot_list))]
+                              for project in projects]
+
+        # Set by decompose(), None means a single search over every project
+        self.components = None
+        self.component_of = None
+        self.search_order = list(indexes)
+        self.swap_pairs = None
+
+        # Zobrist keys of each (project, slot) assignment, for state fingerprints
+        zobrist_rng = random.Random(0)
+        self.zobrist = [[zobrist_rng.getrandbits(64) for _ in self.slot_list]
+                        for _ in projects]
+        self.memo = None
+        self.memo_size = DEFAULT_MEMO_SIZE
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+        # Full and incremental evaluations done in this process and its
+        # worker processes, for benchmarks
+        self.evaluations = 0
+        # When a list, hill climbing appends the neighboors scored at each step
+        self.neighbourhood_sizes = None
+
+    def decompose(self):
+        '''
+        Splits the projects in the connected components of the conflict graph,
+        where two projects are linked when sharing a slot costs something
+        (nonzero pair cost), biggest components first. Then the neighbourhoods
+        walk the projects component by component and only swap projects of
+        the same component.
+
+        This is a heuristic that trades quality for speed: a swap keeps the
+        slot populations while its two moves change them, and it changes the
+        votes and project costs of both slots, so pruning the swaps between
+        components can leave the search in worse local optima.
+        '''
+        indexes = range(len(self.project_list))
+        component_of = [None] * len(self.project_list)
+        components = []
+        for start in indexes:
+            if component_of[start] is not None:
+                continue
+            component_of[start] = start
+            component = [start]
+            for i in component:
+                for j in indexes:
+                    if self.pair_costs[i][j] and component_of[j] is None:
+                        component_of[j] = start
+                        component.append(j)
+            components.append(sorted(component))
+
+        components.sort(key=len, reverse=True)
+        for number, component in enumerate(components):
+            for i in component:
+                component_of[i] = number
+        self.components = components
+        self.component_of = component_of
+        self.search_order = [i for component in components for i in component]
+        self.swap_pairs = [pair for component in components
+                           for pair in combinations(component, 2)]
+
+    @staticmethod
+    def _mask(people, bits):
+        '''Bitmask of `people`, assigning the next free bit in `bits` to new people'''
+        mask = 0
+        for person in people:
+            mask |= 1 << bits.setdefault(person, len(bits))
+        return mask
+
+    def canonical(self):
+        '''
+        JSON-serializable form of the problem that doesn't depend on the order
+        of projects, votes or responsables, used as the cache key of its schedule
+        '''
+        projects = sorted(
+            [project.name, sorted(project.responsables), sorted(project.votes),
+             project.difficult_level, project.theme, sorted(project.priority_slots)]
+            for project in self.projects
+        )
+        return {
+            'projects': projects,
+            'slots': self.slot_list,
+            'responsable_available_masks': self.responsable_available_masks,
+            'weights': [
+                self.responsables_collisions_weight,
+                self.participant_collisions_weight,
+                self.responsable_not_available_weight,
+                self.most_voted_weight,
+                self.slot_population_weight,
+                self.project_not_in_priority_slot_weight,
+                self.same_levels_weight,
+                self.same_theme_weight,
+            ],
+        }
+
+    def penalize_moves(self, current_state, moved_project_weight=1.0):
+        '''
+        Adds a cost to placing the projects of `current_state` in any slot other
+        than their current one, so a reschedule keeps the schedule stable.
+        Projects or slots that are no longer in the problem are ignored.
+        '''
+        moved_project_cost = MOVED_PROJECT_COST * moved_project_weight
+        for project, slot in current_state:
+            i = self.project_index.get(project)
+            current_slot = self.slot_index.get(slot)
+            if i is None or current_slot is None:
+                continue
+            project_costs = self.project_costs[i]
+            for other_slot in range(len(project_costs)):
+                if other_slot != current_slot:
+                    project_costs[other_slot] += moved_project_cost
 
     def neighboors(self, state):
-        ''''Returns the list of neighboors of the state'''
+        '''
+        Returns the list of neighboors of the state. The solvers walk them
+        lazily with ScheduleEvaluator.neighbour_moves() instead.
+        '''
         neighboors = []
-        for project in self.project_list:
-            for slot in self.data.available_slots:
+        for i in self.search_order:
+            project = self.project_list[i]
+            for slot in self.slot_list:
                 d = dict(state)
                 current_slot = d[project]
                 if current_slot != slot:
@@ -68,7 +278,14 @@ class PyCampScheduleProblem:
                     neighboors.append(new_state)
 
         # include swipped projects in neighboors
-        for (proj1, slot1), (proj2, slot2) in combinations(state, 2):
+        if self.swap_pairs is None:
+            pairs = combinations(state, 2)
+        else:
+            slots = dict(state)
+            pairs = (((self.project_list[i], slots[self.project_list[i]]),
+                      (self.project_list[j], slots[self.project_list[j]]))
+                     for i, j in self.swap_pairs)
+        for (proj1, slot1), (proj2, slot2) in pairs:
             d = dict(state)
             if slot1 != slot2:
                 d[proj1] = slot2
@@ -78,90 +295,183 @@ class PyCampScheduleProblem:
 
         return neighboors
 
+    def _pair_cost(self, i, j):
+        cost = 0
+
+        # Cost for having responsables collisions
+        if self.responsables_conflict[i][j]:
+            cost += IMPOSIBLE_COST * self.responsables_collisions_weight
+
+        # Cost for having voters collisions
+        cost += self.voters_overlap[i][j] * self.participant_collisions_weight
+
+        # Cost for same level
+        if self.same_level[i][j]:
+            cost += self.same_levels_weight
+
+        # Cost for same theme
+        if self.same_theme[i][j]:
+            cost += self.same_theme_weight
+
+        return cost
+
+    def _slot_mask(self, slots):
+        '''Bitmask of the positions of the slots, ignoring slots not in the problem'''
+        mask = 0
+        for slot in slots:
+            slot_number = self.slot_index.get(slot)
+            if slot_number is not None:
+                mask |= 1 << slot_number
+        return mask
+
+    def _project_cost(self, project_data, slot_number):
+        cost = 0
+        slot_bit = 1 << slot_number
+
+        # Cost for having projects in slots where responsables are not available
+        for resp in project_data.responsables:
+            available_mask = self.responsable_available_masks.get(resp)
+            if available_mask is not None and not available_mask & slot_bit:
+                cost += IMPOSIBLE_COST * self.responsable_not_available_weight
+
+        # Cost for having a project outside priority slots
+        priority_slots = project_data.priority_slots
+        if len(priority_slots) > 0 and not self._slot_mask(priority_slots) & slot_bit:
+            cost += 10 * self.project_not_in_priority_slot_weight
+
+        return cost
+
+    def slot_cost(self, slot_number, project_quantity, vote_quantity):
+        '''Returns the weighted cost of a slot given its population and votes'''
+        # Cost for having multiple projects in the same slot and preference
+        # for more occupadied slots at the begining
+        slot_population_cost = (3 ** project_quantity) + (slot_number * project_quantity)
+
+        # Cost according to the quantity of votes. It's prefered that most voted projects
+        # were at the begining
+        denom = max(1, self.total_participants)
+        most_voted_cost = (slot_number * vote_quantity) / denom
+
+        return (slot_population_cost * self.slot_population_weight +
+                most_voted_cost * self.most_voted_weight)
+
+    def slots_and_projects(self, state):
+        '''Returns the list of project indexes of each slot, in slot order'''
+        slots_and_projects = [[] for _ in self.slot_list]
+        for project, slot in state:
+            slot_number = self.slot_index.get(slot)
+            if slot_number is not None:
+                slots_and_projects[slot_number].append(self.project_index[project])
+        return slots_and_projects
+
+    def enable_memo(self, max_entries=DEFAULT_MEMO_SIZE):
+        '''
+        Memoizes value() for the `max_entries` states used most recently,
+        keyed by their fingerprint. Hits and misses of this process are
+        counted in memo_hits and memo_misses.
+
+        Only full evaluations go through the memo: the solvers score moves
+        with ScheduleEvaluator deltas and call value() on the states they
+        start from and end at, so it pays off when those repeat, like the
+        DSatur starting states of restarts. Worker processes keep their own
+        memo and counters.
+        '''
+        self.memo = OrderedDict()
+        self.memo_size = max_entries
+
+    def memo_hit_rate(self):
+        lookups = self.memo_hits + self.memo_misses
+        return self.memo_hits / lookups if lookups else 0.0
+
+    def fingerprint(self, state):
+        '''
+        Zobrist hash of the state: the XOR of the keys of its assignments, so
+        it doesn't depend on the order of the state
+        '''
+        fingerprint = 0
+        for project, slot in state:
+            fingerprint ^= self.zobrist[self.project_index[project]][self.slot_index[slot]]
+        return fingerprint
+
     def value(self, state):
         '''Returns the objective value of the state'''
-        responsables_collisions_cost = 0
-        participant_collisions_cost = 0
-        responsable_not_available_cost = 0
-        most_voted_cost = 0
-        slot_population_cost = 0
-        project_not_in_priority_slot_cost = 0
-        same_levels_cost = 0
-        same_theme_cost = 0
-
-        slots_and_projects = OrderedDict()
-        for slot in self.data.available_slots:
-            slots_and_projects[slot] = [proj for proj, proj_slot in state if proj_slot == slot]
-
-        for slot_number, (slot, slot_projects) in enumerate(slots_and_projects.items()):
-            for proj1, proj2 in combinations(slot_projects, 2):
-                proj1_data = self.data.projects[proj1]
-                proj2_data = self.data.projects[proj2]
-
-                set_resp_1 = set(proj1_data.responsables)
-                set_resp_2 = set(proj2_data.responsables)
-
-                # Cost for having responsables collisions
-                if len(set_resp_1.intersection(set_resp_2)) > 0:
-                    responsables_collisions_cost += IMPOSIBLE_COST
-
-                # Cost for having voters collisions
-                set_vot_1 = set(proj1_data.votes)
-                set_vot_2 = set(proj2_data.votes)
-                votes_collisions = len(set_vot_1.intersection(set_vot_2))
-                participant_collisions_cost += votes_collisions
-
-                # Cost for same level
-                if proj1_data.difficult_level == proj2_data.difficult_level:
-                    same_levels_cost += 1
-
-                # Cost for same theme
-                if proj1_data.theme == proj2_data.theme:
-                    same_theme_cost += 1
-
-            # Cost for having multiple projects in the same slot and preference
-            # for more occupadied slots at the begining
-            project_quantity = len(slot_projects)
-            slot_population_cost += (3 ** project_quantity) + (slot_number * project_quantity)
-
-            # Cost according to the quantity of votes. It's prefered that most voted projects
-            # were at the begining
-            vote_quantity = sum([len(self.data.projects[project].votes)
-                                 for project in slot_projects])
-            denom = max(1, self.total_participants)
-            most_voted_cost += (slot_number * vote_quantity) / denom
+        if self.memo is None:
+            return self._value(state)
+
+        fingerprint = self.fingerprint(state)
+        if fingerprint in self.memo:
+            self.memo_hits += 1
+            self.memo.move_to_end(fingerprint)
+            return self.memo[fingerprint]
+
+        self.memo_misses += 1
+        value = self.memo[fingerprint] = self._value(state)
+        if len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+        return value
+
+    def _value(self, state):
+        self.evaluations += 1
+        cost = 0
+        pair_costs = self.pair_costs
+        votes_counts = self.votes_counts
+
+        for slot_number, slot_projects in enumerate(self.slots_and_projects(state)):
+            for i, j in combinations(slot_projects, 2):
+                cost += pair_costs[i][j]
+
+            vote_quantity = sum(votes_counts[i] for i in slot_projects)
+            cost += self.slot_cost(slot_number, len(slot_projects), vote_quantity)
 
         for project, slot in state:
-            project_data = self.data.projects[project]
-            # Cost for having projects in slots where responsables are not available
-            responsables = project_data.responsables
-            for resp in responsables:
-                if slot not in self.data.responsable_available_slots[resp]:
-                    responsable_not_available_cost += IMPOSIBLE_COST
-
-            # Cost for having a project outside priority slots
-            priority_slots = project_data.priority_slots
-            if len(priority_slots) > 0 and slot not in priority_slots:
-                project_not_in_priority_slot_cost += 10
-
-        return -1 * (
-            responsables_collisions_cost * self.responsables_collisions_weight +
-            participant_collisions_cost * self.participant_collisions_weight +
-            responsable_not_available_cost * self.responsable_not_available_weight +
-            most_voted_cost * self.most_voted_weight +
-            slot_population_cost * self.slot_population_weight +
-            project_not_in_priority_slot_cost * self.project_not_in_priority_slot_weight +
-            same_levels_cost * self.same_levels_weight +
-            same_theme_cost * self.same_theme_weight
-        )
+            cost += self.project_costs[self.project_index[project]][self.slot_index[slot]]
 
-    def generate_random_state(self):
+        return -1 * cost
+
+    def generate_random_state(self, rng=random):
         res = []
         for project in self.project_list:
-            random_slot = random.choice(self.data.available_slots)
+            random_slot = rng.choice(self.slot_list)
             res.append((project, random_slot))
         return res
 
+    def generate_dsatur_state(self, rng=random):
+        '''
+        Builds a state colouring the conflict graph like DSatur: the next
+        project placed is the one whose conflicting projects already use the
+        most slots (ties go to the one with more responsable conflicts, voter
+        collisions and votes), in the slot where it adds the least cost.
+        Remaining ties are broken with `rng`.
+        '''
+        indexes = range(len(self.project_list))
+        slots = range(len(self.slot_list))
+        conflicting = [[j for j in indexes
+                        if self.voters_overlap[i][j] > 0 or self.responsables_conflict[i][j]]
+                       for i in indexes]
+        priority = [(sum(self.responsables_conflict[i]), sum(self.voters_overlap[i]),
+                     self.votes_counts[i], rng.random()) for i in indexes]
+
+        evaluator = ScheduleEvaluator(self, [])
+        # Slots used by the conflicting projects already placed
+        saturation = [set() for _ in indexes]
+        unassigned = set(indexes)
+        while unassigned:
+            i = max(unassigned, key=lambda i: (len(saturation[i]), priority[i]))
+            deltas = [evaluator.insert_delta(i, slot) for slot in slots]
+            best_slot = max(slots, key=deltas.__getitem__)
+            evaluator.apply_insert(i, best_slot, deltas[best_slot])
+            unassigned.remove(i)
+            for j in conflicting[i]:
+                saturation[j].add(best_slot)
+
+        return sorted(evaluator.state(), key=lambda assignment: self.project_index[assignment[0]])
+
+    def generate_initial_state(self, strategy='random', rng=random):
+        '''Returns a state to start the search from, built with one of INITIAL_STATES'''
+        if strategy == 'dsatur':
+            return self.generate_dsatur_state(rng)
+        return self.generate_random_state(rng)
+
     def print_state(self, state):
         def empty_slot_template(slot):
             return '|{:^4s}|{:26s}|{:21s}|{:4s}|{:4s}|{:11s}|{:4s}|'.format(
@@ -172,32 +482,21 @@ class PyCampScheduleProblem:
             '', '', '', '', '', '', ''
         )
 
-        slots_and_projects = OrderedDict()
-        for slot in self.data.available_slots:
-            slots_and_projects[slot] = [proj for proj, proj_slot in state if proj_slot == slot]
-
         by_project_votes_collisions = {}
-        for slot_number, (slot, slot_projects) in enumerate(slots_and_projects.items()):
-            total_collisions_on_slot = 0
-            for proj1, proj2 in combinations(slot_projects, 2):
-                proj1_data = self.data.projects[proj1]
-                proj2_data = self.data.projects[proj2]
-                set_vot_1 = set(proj1_data.votes)
-                set_vot_2 = set(proj2_data.votes)
-                votes_collisions = len(set_vot_1.intersection(set_vot_2))
-                total_collisions_on_slot += votes_collisions
-
-            for proj in slot_projects:
-                by_project_votes_collisions[proj] = total_collisions_on_slot
+        for slot_projects in self.slots_and_projects(state):
+            total_collisions_on_slot = sum(self.voters_overlap[i][j]
+                                           for i, j in combinations(slot_projects, 2))
+            for i in slot_projects:
+                by_project_votes_collisions[self.project_list[i]] = total_collisions_on_slot
 
         sorted_by_slot = sorted(state, key=itemgetter(1))
         lines = []
-        for slot in self.data.available_slots:
+        for slot in self.slot_list:
             lines.append(separator_line)
             slot_project_lines = []
             for project, project_slot in sorted_by_slot:
                 if project_slot == slot:
-                    project_data = self.data.projects[project]
+                    project_data = self.projects[self.project_index[project]]
                     responsables = ', '.join(project_data.responsables)
                     number_of_votes = len(project_data.votes)
                     slot_project_lines.append(
@@ -216,66 +515,782 @@ class PyCampScheduleProblem:
         print('\n'.join(lines))
 
 
-def hill_climbing(problem, initial_state):
-    current_state = initial_state
-    current_value = problem.value(initial_state)
+class ScheduleEvaluator:
+    '''
+    Incremental evaluation of a state of a PyCampScheduleProblem.
+
+    Keeps the projects, population and votes of each slot, so the value change
+    of moving a project to another slot or swapping two projects is computed
+    looking only at the affected slots. Projects and slots are referenced by
+    their index in the problem.
+    '''
+    def __init__(self, problem, state):
+        self.problem = problem
+        self.order = [problem.project_index[project] for project, _ in state]
+        self.assignment = [None] * len(problem.project_list)
+        self.slot_projects = [[] for _ in problem.slot_list]
+        self.slot_votes = [0] * len(problem.slot_list)
+        for project, slot in state:
+            self._place(problem.project_index[project], problem.slot_index[slot])
+        self.value = problem.value(state)
+
+    def state(self):
+        project_list = self.problem.project_list
+        slot_list = self.problem.slot_list
+        return [(project_list[i], slot_list[self.assignment[i]]) for i in self.order]
+
+    def _pairs_cost(self, i, slot, excluded=None):
+        row = self.problem.pair_costs[i]
+        cost = sum(row[j] for j in self.slot_projects[slot])
+        if excluded is not None:
+            cost -= row[excluded]
+        return cost
+
+    def move_delta(self, i, slot):
+        '''Returns the value change of moving the project i to the slot'''
+        current_slot = self.assignment[i]
+        if current_slot == slot:
+            return 0
+
+        problem = self.problem
+        problem.evaluations += 1
+        slot_cost = problem.slot_cost
+        votes = problem.votes_counts[i]
+        current_quantity = len(self.slot_projects[current_slot])
+        new_quantity = len(self.slot_projects[slot])
+        current_votes = self.slot_votes[current_slot]
+        new_votes = self.slot_votes[slot]
+        project_costs = problem.project_costs[i]
+
+        cost = (
+            self._pairs_cost(i, slot) - self._pairs_cost(i, current_slot) +
+            slot_cost(current_slot, current_quantity - 1, current_votes - votes) -
+            slot_cost(current_slot, current_quantity, current_votes) +
+            slot_cost(slot, new_quantity + 1, new_votes + votes) -
+            slot_cost(slot, new_quantity, new_votes) +
+            project_costs[slot] - project_costs[current_slot]
+        )
+        return -1 * cost
+
+    def insert_delta(self, i, slot):
+        '''Returns the value change of placing the unassigned project i in the slot'''
+        problem = self.problem
+        problem.evaluations += 1
+        votes = problem.votes_counts[i]
+        quantity = len(self.slot_projects[slot])
+        slot_votes = self.slot_votes[slot]
+
+        cost = (
+            self._pairs_cost(i, slot) +
+            problem.slot_cost(slot, quantity + 1, slot_votes + votes) -
+            problem.slot_cost(slot, quantity, slot_votes) +
+            problem.project_costs[i][slot]
+        )
+        return -1 * cost
+
+    def swap_delta(self, i, j):
+        '''Returns the value change of swapping the slots of the projects i and j'''
+        slot1 = self.assignment[i]
+        slot2 = self.assignment[j]
+        if slot1 == slot2:
+            return 0
+
+        problem = self.problem
+        problem.evaluations += 1
+        slot_cost = problem.slot_cost
+        votes1 = problem.votes_counts[i]
+        votes2 = problem.votes_counts[j]
+        quantity1 = len(self.slot_projects[slot1])
+        quantity2 = len(self.slot_projects[slot2])
+        slot_votes1 = self.slot_votes[slot1]
+        slot_votes2 = self.slot_votes[slot2]
+        project_costs1 = problem.project_costs[i]
+        project_costs2 = problem.project_costs[j]
+
+        cost = (
+            self._pairs_cost(i, slot2, excluded=j) - self._pairs_cost(i, slot1) +
+            self._pairs_cost(j, slot1, excluded=i) - self._pairs_cost(j, slot2) +
+            slot_cost(slot1, quantity1, slot_votes1 - votes1 + votes2) -
+            slot_cost(slot1, quantity1, slot_votes1) +
+            slot_cost(slot2, quantity2, slot_votes2 - votes2 + votes1) -
+            slot_cost(slot2, quantity2, slot_votes2) +
+            project_costs1[slot2] - project_costs1[slot1] +
+            project_costs2[slot1] - project_costs2[slot2]
+        )
+        return -1 * cost
+
+    def _place(self, i, slot):
+        self.assignment[i] = slot
+        self.slot_projects[slot].append(i)
+        self.slot_votes[slot] += self.problem.votes_counts[i]
+
+    def _remove(self, i):
+        slot = self.assignment[i]
+        self.slot_projects[slot].remove(i)
+        self.slot_votes[slot] -= self.problem.votes_counts[i]
+
+    def neighbour_moves(self):
+        '''
+        Yields (move, delta) for every neighboor of the current state, in the
+        same order as PyCampScheduleProblem.neighboors(), without copying it.
+        '''
+        assignment = self.assignment
+        slots = range(len(self.slot_projects))
+        for i in self.problem.search_order:
+            for slot in slots:
+                if assignment[i] != slot:
+                    yield ('move', i, slot), self.move_delta(i, slot)
+
+        # include swipped projects in neighboors
+        swap_pairs = self.problem.swap_pairs
+        if swap_pairs is None:
+            swap_pairs = combinations(self.order, 2)
+        for i, j in swap_pairs:
+            if assignment[i] != assignment[j]:
+                yield ('swap', i, j), self.swap_delta(i, j)
+
+    def random_move(self, rng):
+        '''
+        Returns a random move that changes the state, as ('move', i, slot) or
+        ('swap', i, j), or None if the state has no neighboors.
+        '''
+        projects = len(self.assignment)
+        slots = len(self.slot_projects)
+        if projects == 0 or slots < 2:
+            return None
+
+        i = rng.randrange(projects)
+        if projects > 1 and rng.random() < 0.5:
+            components = self.problem.components
+            if components is None:
+                j = rng.randrange(projects)
+            else:
+                j = rng.choice(components[self.problem.component_of[i]])
+            if self.assignment[i] != self.assignment[j]:
+                return ('swap', i, j)
+        slot = rng.randrange(slots - 1)
+        if slot >= self.assignment[i]:
+            slot += 1
+        return ('move', i, slot)
 
-    while True:
-        neighboors = [(n, problem.value(n)) for n in problem.neighboors(current_state)]
-        if not neighboors:
-            return current_state
-        best_neighbour, best_value = max(neighboors, key=itemgetter(1))
+    def changes(self, move):
+        '''Returns the (project, old slot, new slot) changes done by the move'''
+        kind, i, target = move
+        if kind == 'move':
+            return [(i, self.assignment[i], target)]
+        return [(i, self.assignment[i], self.assignment[target]),
+                (target, self.assignment[target], self.assignment[i])]
 
-        if best_value > current_value:
-            current_value = best_value
-            current_state = best_neighbour
+    def delta(self, move):
+        kind, i, target = move
+        if kind == 'move':
+            return self.move_delta(i, target)
+        return self.swap_delta(i, target)
+
+    def apply(self, move, delta=None):
+        kind, i, target = move
+        if kind == 'move':
+            self.apply_move(i, target, delta)
         else:
-            return current_state
+            self.apply_swap(i, target, delta)
+
+    def apply_move(self, i, slot, delta=None):
+        if delta is None:
+            delta = self.move_delta(i, slot)
+        self._remove(i)
+        self._place(i, slot)
+        self.value += delta
+
+    def apply_insert(self, i, slot, delta=None):
+        if delta is None:
+            delta = self.insert_delta(i, slot)
+        self.order.append(i)
+        self._place(i, slot)
+        self.value += delta
+
+    def apply_swap(self, i, j, delta=None):
+        if delta is None:
+            delta = self.swap_delta(i, j)
+        slot1 = self.assignment[i]
+        slot2 = self.assignment[j]
+        self._remove(i)
+        self._remove(j)
+        self._place(i, slot2)
+        self._place(j, slot1)
+        self.value += delta
+
+
+class ProgressEvent(NamedTuple):
+    '''Progress of a solver, passed to its progress_callback'''
+    iteration: int  # Restart, step or finished chain, depending on the solver
+    best_value: float
+    elapsed: float  # Seconds since the solver started
+    evaluations: int  # Evaluations done since the solver started, workers included
+
+
+class ProgressReporter:
+    '''Sends the ProgressEvent of a solve to `callback`, when there is one'''
+    def __init__(self, problem, callback):
+        self.problem = problem
+        self.callback = callback
+        self.start = time.monotonic()
+        self.evaluations = problem.evaluations
+
+    def __call__(self, iteration, best_value):
+        if self.callback is not None:
+            self.callback(ProgressEvent(
+                iteration, best_value, time.monotonic() - self.start,
+                self.problem.evaluations - self.evaluations))
+
+
+def throttle(callback, interval):
+    '''
+    Wraps a progress callback so it's called at most once every `interval`
+    seconds, dropping the events in between.
+    '''
+    last_call = None
 
+    def throttled(event):
+        nonlocal last_call
+        now = time.monotonic()
+        if last_call is None or now - last_call >= interval:
+            last_call = now
+            callback(event)
+    return throttled
 
-def random_restart_hill_climbing(problem, max_iters=100, max_iters_without_improvement=10):
+
+def deadline_for(time_budget):
+    '''Returns the time.monotonic() deadline for a budget in seconds, or None'''
+    if time_budget is None:
+        return None
+    return time.monotonic() + time_budget
+
+
+def is_expired(deadline):
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def hill_climbing(problem, initial_state, first_improvement=False, deadline=None,
+                  max_steps=None, vectorized=False):
+    '''
+    Moves to the best neighboor until none improves the state. With
+    `first_improvement` it moves to the first improving neighboor found.
+    Once the `deadline` passes or `max_steps` moves were done, returns the
+    state reached so far.
+
+    With `vectorized` the whole neighbourhood is scored at once with NumPy
+    (see batch_evaluator), always moving to the best neighboor.
+    '''
+    if vectorized:
+        return vectorized_hill_climbing(problem, initial_state, deadline, max_steps)
+
+    evaluator = ScheduleEvaluator(problem, initial_state)
+
+    step = 0
+    while not is_expired(deadline) and (max_steps is None or step < max_steps):
+        step += 1
+        evaluations = problem.evaluations
+        best_move = None
+        best_delta = 0
+        for move, delta in evaluator.neighbour_moves():
+            if delta > best_delta:
+                best_move = move
+                best_delta = delta
+                if first_improvement:
+                    break
+        if problem.neighbourhood_sizes is not None:
+            problem.neighbourhood_sizes.append(problem.evaluations - evaluations)
+
+        if best_move is None:
+            break
+
+        evaluator.apply(best_move, best_delta)
+
+    return evaluator.state()
+
+
+def vectorized_hill_climbing(problem, initial_state, deadline=None, max_steps=None):
+    '''Steepest ascent hill climbing on BatchScheduleEvaluator, which needs numpy'''
+    # numpy is optional, so it's only imported when asked for
+    from pycamp_bot.scheduler.batch_evaluator import BatchScheduleEvaluator
+
+    evaluator = BatchScheduleEvaluator(problem, initial_state)
+
+    step = 0
+    while not is_expired(deadline) and (max_steps is None or step < max_steps):
+        step += 1
+        evaluations = problem.evaluations
+        best_move, best_delta = evaluator.best_move()
+        if problem.neighbourhood_sizes is not None:
+            problem.neighbourhood_sizes.append(problem.evaluations - evaluations)
+        if best_move is None:
+            break
+
+        evaluator.apply(best_move, best_delta)
+
+    return evaluator.state()
+
+
+def restart(problem, seed, iteration, first_improvement=False, deadline=None,
+            vectorized=False, initial_state='random'):
+    '''Runs the hill climbing of one restart, seeded by the restart number'''
+    rng = random.Random('{}:{}'.format(seed, iteration))
+    initial_state = problem.generate_initial_state(initial_state, rng)
+    solution = hill_climbing(problem, initial_state, first_improvement, deadline,
+                             vectorized=vectorized)
+    return solution, problem.value(solution)
+
+
+def repair(problem, current_state, max_steps=None, deadline=None):
+    '''
+    Local repair of an existing schedule: places the projects missing from
+    `current_state` in their cheapest slot, one at a time, and hill climbs
+    from there for at most `max_steps` moves.
+    '''
+    placed = [(project, slot) for project, slot in current_state
+              if project in problem.project_index and slot in problem.slot_index]
+    evaluator = ScheduleEvaluator(problem, placed)
+    slots = range(len(problem.slot_list))
+    for i, current_slot in enumerate(evaluator.assignment):
+        if current_slot is None:
+            deltas = [evaluator.insert_delta(i, slot) for slot in slots]
+            best_slot = max(slots, key=deltas.__getitem__)
+            evaluator.apply_insert(i, best_slot, deltas[best_slot])
+    return hill_climbing(problem, evaluator.state(), deadline=deadline, max_steps=max_steps)
+
+
+_worker_problem = None
+
+
+def _init_worker(problem):
+    global _worker_problem
+    _worker_problem = problem
+
+
+def _worker_call(function, args):
+    '''Returns the result of the call and the evaluations it did in the worker'''
+    evaluations = _worker_problem.evaluations
+    result = function(_worker_problem, *args)
+    return result, _worker_problem.evaluations - evaluations
+
+
+def _mp_context():
+    '''
+    Workers don't fork the calling process, the bot has other threads running
+    and forking them is unsafe.
+    '''
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def parallel_map(problem, function, arguments, workers):
+    '''
+    Yields function(problem, *args) for each args of `arguments`, in order,
+    running them in a pool of worker processes. Only a few calls are queued
+    ahead, so closing the generator stops the pool soon. The evaluations of
+    the workers are added to problem.evaluations as their results arrive.
+    '''
+    def collect(future):
+        result, evaluations = future.result()
+        problem.evaluations += evaluations
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context(),
+                             initializer=_init_worker, initargs=(problem,)) as executor:
+        pending = deque()
+        try:
+            for args in arguments:
+                if len(pending) == 2 * workers:
+                    yield collect(pending.popleft())
+                pending.append(executor.submit(_worker_call, function, args))
+            while pending:
+                yield collect(pending.popleft())
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+SOLVERS = {}
+DEFAULT_SOLVER = 'hill_climbing'
+
+
+def solver(name):
+    '''
+    Registers a scheduling engine selectable by name. Engines are called as
+    engine(problem, workers=1, seed=None, time_budget=None,
+    progress_callback=None, **options) and return the best state. They stop
+    when `time_budget` seconds have passed and call `progress_callback` with
+    a ProgressEvent at least each time the best value improves.
+    '''
+    def register(engine):
+        SOLVERS[name] = engine
+        return engine
+    return register
+
+
+def best_of_chains(problem, run, seed, workers, args, progress_callback=None):
+    '''
+    Runs one independent chain of `run` per worker and returns the best state.
+    Chains running in this process report their own progress, the parallel
+    ones report when they finish.
+    '''
+    if workers == 1:
+        best_state, _ = run(problem, seed, 0, *args, progress_callback=progress_callback)
+        return best_state
+
+    report = ProgressReporter(problem, progress_callback)
     best_state = None
     best_value = None
+    arguments = [(seed, chain) + args for chain in range(workers)]
+    for chain, (state, value) in enumerate(parallel_map(problem, run, arguments, workers)):
+        if best_value is None or value > best_value:
+            best_state = state
+            best_value = value
+            report(chain, best_value)
+    return best_state
 
-    number_of_iterations_without_improvement = 0
-    for iteration in range(max_iters):
-        print('Iteration {:3d} # Best value {}'.format(iteration, best_value))
-        initial_state = problem.generate_random_state()
-        current_solution = hill_climbing(problem, initial_state)
-        current_value = problem.value(current_solution)
 
+@solver('hill_climbing')
+def random_restart_hill_climbing(problem, max_iters=100, max_iters_without_improvement=10,
+                                 workers=1, seed=None, first_improvement=False,
+                                 time_budget=None, progress_callback=None, vectorized=False,
+                                 initial_state='random'):
+    '''
+    Runs hill climbing from random states, or the `initial_state` strategy,
+    and returns the best solution. Progress is reported after every restart.
+
+    Every restart gets its own random generator derived from `seed`, so the
+    same seed gives the same result regardless of the number of `workers`.
+    '''
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    deadline = deadline_for(time_budget)
+    report = ProgressReporter(problem, progress_callback)
+
+    arguments = [(seed, iteration, first_improvement, deadline, vectorized, initial_state)
+                 for iteration in range(max_iters)]
+    if workers > 1:
+        restarts = parallel_map(problem, restart, arguments, workers)
+    else:
+        restarts = (restart(problem, *args) for args in arguments)
+
+    best_state = None
+    best_value = None
+
+    number_of_iterations_without_improvement = 0
+    for iteration, (current_solution, current_value) in enumerate(restarts):
         if best_value is None or current_value > best_value:
             best_value = current_value
             best_state = current_solution
-
             number_of_iterations_without_improvement = 0
         else:
             number_of_iterations_without_improvement += 1
-            if number_of_iterations_without_improvement == max_iters_without_improvement:
-                break
+
+        report(iteration, best_value)
+        if number_of_iterations_without_improvement == max_iters_without_improvement:
+            break
+
+        if is_expired(deadline):
+            break
+    restarts.close()
 
     return best_state
 
 
-def export_scheduled_result(myjson):
-    problem = PyCampScheduleProblem(myjson)
-    best_solution = random_restart_hill_climbing(problem,
-                                                 max_iters=10000,
-                                                 max_iters_without_improvement=10)
-    return best_solution
+def initial_temperature(evaluator, rng, samples=100):
+    '''
+    Temperature that accepts the median worsening move half of the times,
+    ignoring moves with an impossible cost.
+    '''
+    worsening = []
+    for _ in range(samples):
+        move = evaluator.random_move(rng)
+        if move is None:
+            break
+        delta = evaluator.delta(move)
+        if -IMPOSIBLE_COST < delta < 0:
+            worsening.append(-delta)
+    if not worsening:
+        return 1.0
+    worsening.sort()
+    return worsening[len(worsening) // 2] / math.log(2)
+
+
+def anneal(problem, seed, chain, max_steps, start_temperature, final_temperature,
+           time_budget, initial_state='random', progress_callback=None):
+    '''
+    Runs one simulated annealing chain and returns its best state and value.
+    The temperature cools with the fraction of steps or of time budget used,
+    whichever is bigger. Without `max_steps` the chain runs until the budget.
+    '''
+    report = ProgressReporter(problem, progress_callback)
+    rng = random.Random('{}:{}'.format(seed, chain))
+    evaluator = ScheduleEvaluator(problem, problem.generate_initial_state(initial_state, rng))
+    best_state = evaluator.state()
+    best_value = evaluator.value
+
+    if start_temperature is None:
+        start_temperature = initial_temperature(evaluator, rng)
+    cooling = final_temperature / start_temperature
+    start = time.monotonic()
+
+    step = 0
+    progress = 0
+    while progress < 1:
+        move = evaluator.random_move(rng)
+        if move is None:
+            break
+        temperature = start_temperature * cooling ** progress
+        delta = evaluator.delta(move)
+        if delta >= 0 or rng.random() < math.exp(delta / temperature):
+            evaluator.apply(move, delta)
+            if evaluator.value > best_value:
+                best_value = evaluator.value
+                best_state = evaluator.state()
+                report(step, best_value)
+
+        step += 1
+        progress = 0
+        if max_steps is not None:
+            progress = step / max(1, max_steps)
+        if time_budget is not None:
+            progress = max(progress, (time.monotonic() - start) / time_budget)
+
+    return best_state, problem.value(best_state)
+
+
+@solver('simulated_annealing')
+def simulated_annealing(problem, workers=1, seed=None, max_steps=None,
+                        start_temperature=None, final_temperature=0.01,
+                        time_budget=None, progress_callback=None, initial_state='random'):
+    '''
+    Samples random moves and accepts worsening ones with a probability that
+    decreases as the temperature cools down. Runs one chain per worker.
+    '''
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if max_steps is None and time_budget is None:
+        max_steps = 100 * len(problem.project_list) * len(problem.slot_list)
+    args = (max_steps, start_temperature, final_temperature, time_budget, initial_state)
+    return best_of_chains(problem, anneal, seed, workers, args, progress_callback)
+
+
+def tabu_walk(problem, seed, chain, max_steps, max_steps_without_improvement,
+              sample_size, tenure, deadline, initial_state='random', progress_callback=None):
+    '''Runs one tabu search chain and returns its best state and value'''
+    report = ProgressReporter(problem, progress_callback)
+    rng = random.Random('{}:{}'.format(seed, chain))
+    evaluator = ScheduleEvaluator(problem, problem.generate_initial_state(initial_state, rng))
+    best_state = evaluator.state()
+    best_value = evaluator.value
+
+    # (project, slot) -> step until the project can't go back to the slot
+    tabu = {}
+    steps_without_improvement = 0
+    for step in range(max_steps):
+        if is_expired(deadline):
+            break
+
+        candidate = None
+        candidate_delta = None
+        for _ in range(sample_size):
+            move = evaluator.random_move(rng)
+            if move is None:
+                return best_state, problem.value(best_state)
+            delta = evaluator.delta(move)
+            is_tabu = any(tabu.get((i, new_slot), -1) >= step
+                          for i, _, new_slot in evaluator.changes(move))
+            # aspiration: a tabu move is allowed if it beats the best value
+            if is_tabu and evaluator.value + delta <= best_value:
+                continue
+            if candidate is None or delta > candidate_delta:
+                candidate = move
+                candidate_delta = delta
+
+        if candidate is not None:
+            for i, old_slot, _ in evaluator.changes(candidate):
+                tabu[(i, old_slot)] = step + tenure
+            evaluator.apply(candidate, candidate_delta)
+
+        if evaluator.value > best_value:
+            best_value = evaluator.value
+            best_state = evaluator.state()
+            report(step, best_value)
+            steps_without_improvement = 0
+        else:
+            steps_without_improvement += 1
+            if steps_without_improvement == max_steps_without_improvement:
+                break
+
+    return best_state, problem.value(best_state)
+
+
+@solver('tabu_search')
+def tabu_search(problem, workers=1, seed=None, max_steps=5000,
+                max_steps_without_improvement=500, sample_size=None, tenure=None,
+                time_budget=None, progress_callback=None, initial_state='random'):
+    '''
+    Takes the best of a sample of random moves at each step, even when it
+    makes the state worse, forbidding projects to go back to the slots they
+    just left for `tenure` steps. Runs one chain per worker.
+    '''
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if sample_size is None:
+        sample_size = max(10, len(problem.project_list))
+    if tenure is None:
+        tenure = max(5, len(problem.project_list) // 3)
+    args = (max_steps, max_steps_without_improvement, sample_size, tenure,
+            deadline_for(time_budget), initial_state)
+    return best_of_chains(problem, tabu_walk, seed, workers, args, progress_callback)
+
+
+def default_workers():
+    '''Number of worker processes for the scheduler, from the environment or CPU count'''
+    workers = os.environ.get(SCHEDULER_WORKERS_ENVVAR)
+    if workers:
+        return max(1, int(workers))
+    return os.cpu_count() or 1
+
+
+def default_time_budget():
+    '''Seconds the bot waits for a schedule, from the environment'''
+    return float(os.environ.get(SCHEDULER_TIME_BUDGET_ENVVAR) or DEFAULT_TIME_BUDGET)
+
+
+# Options used by the bot for each solver, on top of the solver defaults
+EXPORT_OPTIONS = {
+    'hill_climbing': {'max_iters': 10000, 'max_iters_without_improvement': 10},
+}
+
+
+def solve(problem, solver=DEFAULT_SOLVER, workers=None, seed=None, **options):
+    if workers is None:
+        workers = default_workers()
+    options = dict(EXPORT_OPTIONS.get(solver, {}), **options)
+    return SOLVERS[solver](problem, workers=workers, seed=seed, **options)
+
+
+def schedule_problem(problem, solver=DEFAULT_SOLVER, workers=None, seed=None,
+                     time_budget=None, progress_callback=None, use_cache=True,
+                     decompose=False, **options):
+    '''
+    Computes the schedule of the bot. It takes at most `time_budget` seconds
+    (PYCAMP_SCHEDULER_TIME_BUDGET by default) and returns the best schedule
+    found by then. With `use_cache`, schedules already solved with the same
+    problem and parameters are read from the cache instead. With `decompose`
+    the search is split by the components of the conflict graph, faster on
+    sparse instances but usually worse (see decompose()).
+    '''
+    if time_budget is None:
+        time_budget = default_time_budget()
+    # The chain solvers run one chain per worker, so the result depends on it
+    if workers is None:
+        workers = default_workers()
+    if decompose:
+        problem.decompose()
+
+    if use_cache:
+        cache = default_cache()
+        key = schedule_key(problem, solver, seed, dict(
+            options, time_budget=time_budget, decompose=decompose, workers=workers))
+        cached_state = cache.get(key)
+        if cached_state is not None:
+            return cached_state
+
+    state = solve(problem, solver=solver, workers=workers, seed=seed,
+                  time_budget=time_budget, progress_callback=progress_callback, **options)
+    if use_cache:
+        cache.put(key, state)
+    return state
+
+
+def reschedule_problem(problem, current_state, moved_project_weight=1.0, max_steps=None,
+                       time_budget=None):
+    '''
+    Updates the schedule of the bot after late votes or projects, starting
+    from the `current_state` instead of random states. Moving a scheduled
+    project costs MOVED_PROJECT_COST times `moved_project_weight`, and the
+    repair does at most `max_steps` moves (the number of projects by default).
+    '''
+    if time_budget is None:
+        time_budget = default_time_budget()
+    if max_steps is None:
+        max_steps = len(problem.project_list)
+    problem.penalize_moves(current_state, moved_project_weight)
+    return repair(problem, current_state, max_steps, deadline_for(time_budget))
+
+
+def export_scheduled_result(myjson, **options):
+    '''Like schedule_problem(), for input in the format of export_db_2_json'''
+    return schedule_problem(PyCampScheduleProblem(myjson), **options)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compute a PyCamp schedule from a JSON file.')
+    parser.add_argument('input_file', nargs='?', default='input_example.json',
+                        help='JSON file in the format of export_db_2_json.')
+    parser.add_argument('--solver', choices=sorted(SOLVERS), default=DEFAULT_SOLVER,
+                        help='Search engine used to compute the schedule.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: {} or CPU count).'.format(
+                            SCHEDULER_WORKERS_ENVVAR))
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed, to get reproducible schedules.')
+    parser.add_argument('--first-improvement', action='store_true',
+                        help='Hill climbing takes the first improving neighboor.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Solve in this process and show the cost and time of each term.')
+    parser.add_argument('--memo', action='store_true',
+                        help='Memoize full evaluations of states (not move deltas) and show '
+                             'the hit rate. Solves in one process.')
+    parser.add_argument('--initial-state', choices=INITIAL_STATES, default='random',
+                        help='How the solvers build the states they start from.')
+    parser.add_argument('--decompose', action='store_true',
+                        help='Split the search by the components of the conflict graph '
+                             '(faster, usually worse schedules).')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='Hill climbing scores the neighbourhood with NumPy.')
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help='Seconds to search; the best schedule found by then is shown.')
+    return parser.parse_args()
 
 
 if __name__ == '__main__':
-    try:
-        input_file = sys.argv[1]
-    except IndexError:
-        input_file = 'input_example.json'
+    args = parse_args()
 
-    data = open(input_file, 'r').read()
+    data = open(args.input_file, 'r').read()
 
     data = json.loads(data)
     problem = PyCampScheduleProblem(data)
-    best_solution = random_restart_hill_climbing(problem,
-                                                 max_iters=10000,
-                                                 max_iters_without_improvement=10)
+    if args.decompose:
+        problem.decompose()
+    if args.memo:
+        problem.enable_memo()
+    options = {'initial_state': args.initial_state}
+    if args.first_improvement:
+        options['first_improvement'] = True
+    if args.vectorized:
+        options['vectorized'] = True
+
+    def progress_callback(event):
+        print('Iteration {:5d} | best value {:.2f} | {:6.1f}s | {} evaluations'.format(*event))
+
+    if args.profile:
+        from pycamp_bot.scheduler.profiler import format_report, profile
+        best_solution, report = profile(problem, solver=args.solver, seed=args.seed,
+                                        time_budget=args.time_budget,
+                                        progress_callback=progress_callback, **options)
+    else:
+        # The memo counters of worker processes are lost
+        workers = 1 if args.memo else args.workers
+        best_solution = solve(problem, solver=args.solver, workers=workers, seed=args.seed,
+                              time_budget=args.time_budget, progress_callback=progress_callback,
+                              **options)
     problem.print_state(best_solution)
+    if args.profile:
+        print(format_report(report))
+    if args.memo:
+        print('Memo hit rate {:.1%} ({} hits, {} misses)'.format(
+            problem.memo_hit_rate(), problem.memo_hits, problem.memo_misses))
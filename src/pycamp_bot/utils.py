@@ -24,7 +24,7 @@ def get_slot_weekday_name(slot_day_code):
         6: 'Domingo',
     }
 
-    pycamp_start_weekday = Pycamp.get(Pycamp.active == True).init.weekday()
+    pycamp_start_weekday = Pycamp.get_active().init.weekday()
 
     # Convert slot day code to a zero-based code, to use it as an
     # offset to get the weekday name of the slot
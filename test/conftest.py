@@ -5,10 +5,12 @@ from functools import wraps
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock
 
+import pytest
 from peewee import SqliteDatabase
 
+from pycamp_bot.constants import SCHEDULER_CACHE_DIR_ENVVAR
 from pycamp_bot.models import (
-    Pycampista, Slot, Pycamp, WizardAtPycamp, PycampistaAtPycamp, Project, Vote
+    Pycampista, Slot, Pycamp, WizardAtPycamp, PycampistaAtPycamp, Project, Vote, invalidate,
 )
 
 # -----------------------------------------------------------------------------
@@ -29,6 +31,20 @@ test_db = SqliteDatabase(':memory:')
 MODELS = [Pycampista, Slot, Pycamp, WizardAtPycamp, PycampistaAtPycamp, Project, Vote]
 
 
+@pytest.fixture(autouse=True)
+def schedule_cache_dir(tmp_path, monkeypatch):
+    """Keep the cache of solved schedules of each test in its own directory."""
+    monkeypatch.setenv(SCHEDULER_CACHE_DIR_ENVVAR, str(tmp_path / "schedule_cache"))
+
+
+@pytest.fixture(autouse=True)
+def model_caches():
+    """Don't share the values cached by the models between the databases of the tests."""
+    invalidate()
+    yield
+    invalidate()
+
+
 def use_test_database(fn):
     """Bind the given models to the db for the duration of wrapped block."""
     @wraps(fn)
@@ -127,4 +143,5 @@ def make_context():
     context.bot = AsyncMock()
     context.bot.send_message = AsyncMock()
     context.bot.edit_message_text = AsyncMock()
+    context.bot_data = {}
     return context
@@ -1,5 +1,6 @@
+from unittest.mock import patch
 from pycamp_bot.models import Pycampista
-from pycamp_bot.commands.auth import get_admins_username
+from pycamp_bot.commands.auth import get_admins_username, username_is_admin
 from test.conftest import use_test_database, test_db, MODELS
 
 
@@ -54,3 +55,33 @@ class TestGetAdminsUsername:
     def test_no_users_returns_empty(self):
         result = get_admins_username()
         assert result == []
+
+
+class TestUsernameIsAdmin:
+
+    @use_test_database
+    def test_checks_admin_flag(self):
+        Pycampista.create(username="admin1", admin=True)
+        Pycampista.create(username="user1", admin=False)
+        assert username_is_admin("admin1")
+        assert not username_is_admin("user1")
+        assert not username_is_admin("unknown")
+
+    @use_test_database
+    def test_admins_are_read_once(self):
+        Pycampista.create(username="admin1", admin=True)
+        execute_sql = test_db.execute_sql
+        with patch.object(test_db, "execute_sql", side_effect=execute_sql) as spy:
+            for _ in range(3):
+                assert username_is_admin("admin1")
+        assert spy.call_count == 1
+
+    @use_test_database
+    def test_saving_a_pycampista_refreshes_admins(self):
+        user = Pycampista.create(username="pepe", admin=False)
+        assert not username_is_admin("pepe")
+        user.admin = True
+        user.save()
+        assert username_is_admin("pepe")
+        user.delete_instance()
+        assert not username_is_admin("pepe")
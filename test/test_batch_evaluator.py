@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pycamp_bot.scheduler.batch_evaluator import BatchScheduleEvaluator  # noqa: E402
+from pycamp_bot.scheduler.benchmark.generator import generate_instance  # noqa: E402
+from pycamp_bot.scheduler.schedule_calculator import (  # noqa: E402
+    PyCampScheduleProblem,
+    ScheduleEvaluator,
+    hill_climbing,
+    random_restart_hill_climbing,
+)
+from test.test_scheduler import _load_data_example  # noqa: E402
+
+
+def _evaluators(seed=0):
+    problem = PyCampScheduleProblem(_load_data_example())
+    state = problem.generate_random_state(random.Random(seed))
+    return ScheduleEvaluator(problem, state), BatchScheduleEvaluator(problem, state)
+
+
+class TestBatchScheduleEvaluator:
+
+    def test_batch_deltas_match_evaluator(self):
+        evaluator, batch = _evaluators()
+        moves = [move for move, _ in evaluator.neighbour_moves()]
+        moves += [("move", 0, evaluator.assignment[0]), ("swap", 1, 1)]
+        expected = [evaluator.delta(move) for move in moves]
+        assert batch.batch_deltas(moves) == pytest.approx(expected, abs=1e-6)
+
+    def test_empty_batch(self):
+        _, batch = _evaluators()
+        assert len(batch.batch_deltas([])) == 0
+
+    def test_neighbour_deltas_match_evaluator(self):
+        evaluator, batch = _evaluators(seed=1)
+        move_deltas, swap_deltas = batch.neighbour_deltas()
+        for (kind, i, target), delta in evaluator.neighbour_moves():
+            i, target = (i, target) if kind == "move" or i < target else (target, i)
+            matrix = move_deltas if kind == "move" else swap_deltas
+            assert matrix[i, target] == pytest.approx(delta, abs=1e-6)
+        moves = len(list(evaluator.neighbour_moves()))
+        assert np.isfinite(move_deltas).sum() + np.isfinite(swap_deltas).sum() == moves
+
+    def test_apply_keeps_pair_costs_in_sync(self):
+        evaluator, batch = _evaluators(seed=2)
+        rng = random.Random(2)
+        for _ in range(50):
+            batch.apply(batch.random_move(rng))
+        fresh = BatchScheduleEvaluator(batch.problem, batch.state())
+        assert batch.slot_pair_costs == pytest.approx(fresh.slot_pair_costs)
+        assert batch.value == pytest.approx(batch.problem.value(batch.state()), abs=1e-6)
+
+    def test_neighbour_deltas_skip_swaps_across_components(self):
+        problem = PyCampScheduleProblem(generate_instance(
+            projects=20, voters=100, slots=6, vote_density=0.01, responsables=20),
+            same_levels_weight=0, same_theme_weight=0)
+        problem.decompose()
+        assert len(problem.components) > 1
+        state = problem.generate_random_state(random.Random(0))
+        evaluator = ScheduleEvaluator(problem, state)
+        _, swap_deltas = BatchScheduleEvaluator(problem, state).neighbour_deltas()
+        swaps = [move for move, _ in evaluator.neighbour_moves() if move[0] == "swap"]
+        assert np.isfinite(swap_deltas).sum() == len(swaps)
+
+
+class TestVectorizedHillClimbing:
+
+    def test_reaches_local_optimum(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = hill_climbing(problem, problem.generate_random_state(random.Random(3)),
+                              vectorized=True)
+        evaluator = ScheduleEvaluator(problem, state)
+        assert all(delta <= 1e-6 for _, delta in evaluator.neighbour_moves())
+
+    def test_matches_pure_python_value(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        initial = problem.generate_random_state(random.Random(4))
+        pure = hill_climbing(problem, initial)
+        vectorized = hill_climbing(problem, initial, vectorized=True)
+        assert problem.value(vectorized) == pytest.approx(problem.value(pure), abs=1e-6)
+
+    def test_restarts_on_large_instance(self):
+        problem = PyCampScheduleProblem(generate_instance(projects=120, voters=300, slots=16))
+        state = random_restart_hill_climbing(problem, max_iters=1, seed=0, vectorized=True)
+        assert sorted(project for project, _ in state) == sorted(problem.project_list)
@@ -0,0 +1,85 @@
+from pycamp_bot.scheduler.benchmark.generator import (
+    REFERENCE_INSTANCES, generate_instance, reference_instance, slot_codes,
+)
+from pycamp_bot.scheduler.benchmark.runner import compare, run_benchmark
+from pycamp_bot.scheduler.schedule_calculator import PyCampScheduleProblem
+
+
+class TestGenerateInstance:
+
+    def test_has_export_db_2_json_format(self):
+        data = generate_instance(projects=10, voters=20, slots=6, seed=1)
+        assert set(data) == {"projects", "available_slots", "responsable_available_slots"}
+        assert data["available_slots"] == ["A1", "A2", "A3", "A4", "A5", "B1"]
+        assert len(data["projects"]) == 10
+        for project in data["projects"].values():
+            assert set(project) == {"priority_slots", "difficult_level", "responsables",
+                                    "votes", "theme"}
+            for responsable in project["responsables"]:
+                assert responsable in data["responsable_available_slots"]
+
+    def test_same_seed_same_instance(self):
+        assert generate_instance(seed=3) == generate_instance(seed=3)
+        assert generate_instance(seed=3) != generate_instance(seed=4)
+
+    def test_vote_density(self):
+        data = generate_instance(projects=20, voters=100, vote_density=0.0)
+        assert all(project["votes"] == [] for project in data["projects"].values())
+        data = generate_instance(projects=20, voters=100, vote_density=1.0)
+        assert all(len(project["votes"]) == 100 for project in data["projects"].values())
+
+    def test_responsables_count(self):
+        data = generate_instance(projects=30, responsables=3)
+        assert len(data["responsable_available_slots"]) <= 3
+
+    def test_reference_instances_build_problems(self):
+        for name, params in REFERENCE_INSTANCES.items():
+            problem = PyCampScheduleProblem(reference_instance(name))
+            assert len(problem.project_list) == params["projects"]
+            assert len(problem.slot_list) == params["slots"]
+
+    def test_slot_codes(self):
+        assert slot_codes(7, slots_per_day=3) == ["A1", "A2", "A3", "B1", "B2", "B3", "C1"]
+
+
+class TestRunBenchmark:
+
+    def test_reports_measurements(self):
+        data = generate_instance(projects=6, voters=10, slots=4, seed=1)
+        result = run_benchmark(data, "tabu_search", seed=1, max_steps=50)
+        assert result["projects"] == 6
+        assert result["slots"] == 4
+        assert result["wall_time"] > 0
+        assert result["evaluations"] > 0
+        assert result["evaluations_per_second"] > 0
+        assert result["peak_memory"] > 0
+        assert result["cost"] > 0
+
+    def test_memory_measure_is_optional(self):
+        data = generate_instance(projects=4, voters=10, slots=3, seed=1)
+        result = run_benchmark(data, "simulated_annealing", measure_memory=False, max_steps=50)
+        assert result["peak_memory"] is None
+
+
+class TestCompare:
+
+    def _result(self, cost, speed):
+        return {"instance": "small", "solver": "tabu_search", "seed": 0,
+                "cost": cost, "evaluations_per_second": speed}
+
+    def test_no_regressions(self):
+        assert compare([self._result(100, 1000)], [self._result(100, 1000)]) == []
+
+    def test_detects_worse_cost(self):
+        regressions = compare([self._result(120, 1000)], [self._result(100, 1000)])
+        assert len(regressions) == 1
+        assert "cost" in regressions[0]
+
+    def test_detects_slower_evaluations(self):
+        regressions = compare([self._result(100, 500)], [self._result(100, 1000)])
+        assert len(regressions) == 1
+        assert "evaluations/s" in regressions[0]
+
+    def test_ignores_results_without_baseline(self):
+        result = dict(self._result(500, 1), seed=9)
+        assert compare([result], [self._result(100, 1000)]) == []
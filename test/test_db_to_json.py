@@ -1,6 +1,11 @@
 from datetime import datetime
-from pycamp_bot.models import Pycampista, Project, Slot, Vote
-from pycamp_bot.scheduler.db_to_json import export_db_2_json
+from unittest.mock import patch
+
+from pycamp_bot.models import Pycamp, Pycampista, Project, Slot, Vote
+from pycamp_bot.scheduler.db_to_json import (
+    build_schedule_problem, export_current_schedule, export_db_2_json,
+)
+from pycamp_bot.scheduler.schedule_calculator import IMPOSIBLE_COST, PyCampScheduleProblem
 from test.conftest import use_test_database, test_db, MODELS
 
 
@@ -86,3 +91,134 @@ class TestExportDb2Json:
         votes = result["projects"]["MiProyecto"]["votes"]
         assert "juan" in votes
         assert "maria" not in votes
+
+    @use_test_database
+    def test_runs_constant_number_of_queries(self):
+        owners = [Pycampista.create(username=f"owner{i}") for i in range(5)]
+        voters = [Pycampista.create(username=f"voter{i}") for i in range(10)]
+        Slot.create(code="A1", start=datetime(2024, 6, 21, 10, 0), current_wizard=owners[0])
+        for i, owner in enumerate(owners):
+            project = Project.create(name=f"Proyecto{i}", owner=owner)
+            for voter in voters:
+                Vote.create(
+                    project=project, pycampista=voter, interest=True,
+                    _project_pycampista_id=f"{project.id}-{voter.id}",
+                )
+
+        with patch.object(test_db, "execute_sql", wraps=test_db.execute_sql) as execute_sql:
+            result = export_db_2_json()
+
+        assert execute_sql.call_count == 3
+        assert len(result["projects"]) == 5
+        for project in result["projects"].values():
+            assert sorted(project["votes"]) == sorted(v.username for v in voters)
+
+    @use_test_database
+    def test_projects_without_votes_have_empty_list(self):
+        owner = Pycampista.create(username="pepe")
+        Project.create(name="MiProyecto", owner=owner)
+        result = export_db_2_json()
+        assert result["projects"]["MiProyecto"]["votes"] == []
+
+
+class TestArriveLeaveAvailability:
+
+    @use_test_database
+    def test_owner_available_between_arrive_and_leave(self):
+        owner = Pycampista.create(
+            username="pepe", arrive=datetime(2024, 6, 21, 11, 0),
+            leave=datetime(2024, 6, 22, 11, 0),
+        )
+        for code, start in [("A1", datetime(2024, 6, 21, 10, 0)),
+                            ("A2", datetime(2024, 6, 21, 11, 0)),
+                            ("B1", datetime(2024, 6, 22, 10, 0)),
+                            ("B2", datetime(2024, 6, 22, 11, 0))]:
+            Slot.create(code=code, start=start, current_wizard=owner)
+        Project.create(name="MiProyecto", owner=owner)
+
+        result = export_db_2_json()
+        assert result["responsable_available_slots"]["pepe"] == ["A2", "B1"]
+
+    @use_test_database
+    def test_hour_slots_use_active_pycamp_days(self):
+        Pycamp.create(headquarters="Narnia", active=True, init=datetime(2024, 6, 20))
+        owner = Pycampista.create(username="pepe", arrive=datetime(2024, 6, 21, 9, 0))
+        Slot.create(code="A1", start=9)
+        Slot.create(code="B1", start=9)
+        Slot.create(code="B2", start=10)
+        Project.create(name="MiProyecto", owner=owner)
+
+        result = export_db_2_json()
+        assert result["responsable_available_slots"]["pepe"] == ["B1", "B2"]
+
+    @use_test_database
+    def test_hour_slots_without_active_pycamp_are_available(self):
+        owner = Pycampista.create(username="pepe", arrive=datetime(2024, 6, 21, 9, 0))
+        Slot.create(code="A1", start=9)
+        Project.create(name="MiProyecto", owner=owner)
+
+        result = export_db_2_json()
+        assert result["responsable_available_slots"]["pepe"] == ["A1"]
+
+    @use_test_database
+    def test_problem_avoids_slots_before_arrival(self):
+        Pycamp.create(headquarters="Narnia", active=True, init=datetime(2024, 6, 20))
+        owner = Pycampista.create(username="pepe", arrive=datetime(2024, 6, 21, 9, 0))
+        Slot.create(code="A1", start=9)
+        Slot.create(code="B1", start=9)
+        Project.create(name="MiProyecto", owner=owner)
+
+        with patch.object(test_db, "execute_sql", wraps=test_db.execute_sql) as execute_sql:
+            problem = build_schedule_problem()
+        # Los slots guardan solo la hora: se consulta también el PyCamp activo
+        assert execute_sql.call_count == 4
+        assert problem.project_costs == [[IMPOSIBLE_COST, 0]]
+        assert problem.responsable_available_masks == {"pepe": 0b10}
+
+
+class TestBuildScheduleProblem:
+
+    def _create_data(self):
+        pepe = Pycampista.create(username="pepe")
+        ana = Pycampista.create(username="ana")
+        juan = Pycampista.create(username="juan")
+        Slot.create(code="A1", start=datetime(2024, 6, 21, 10, 0), current_wizard=pepe)
+        Slot.create(code="A2", start=datetime(2024, 6, 21, 11, 0), current_wizard=pepe)
+        django = Project.create(name="Django", owner=pepe, topic="web", difficult_level=2)
+        flask = Project.create(name="Flask", owner=ana, topic="web", difficult_level=1)
+        for project in (django, flask):
+            Vote.create(
+                project=project, pycampista=juan, interest=True,
+                _project_pycampista_id=f"{project.id}-{juan.id}",
+            )
+
+    @use_test_database
+    def test_matches_json_path(self):
+        self._create_data()
+        from_json = PyCampScheduleProblem(export_db_2_json())
+        problem = build_schedule_problem()
+        assert problem.data is None
+        assert problem.project_list == from_json.project_list
+        assert problem.slot_list == from_json.slot_list
+        assert problem.pair_costs == from_json.pair_costs
+        assert problem.project_costs == from_json.project_costs
+        state = [("Django", "A1"), ("Flask", "A1")]
+        assert problem.value(state) == from_json.value(state)
+
+    @use_test_database
+    def test_runs_constant_number_of_queries(self):
+        self._create_data()
+        with patch.object(test_db, "execute_sql", wraps=test_db.execute_sql) as execute_sql:
+            build_schedule_problem()
+        assert execute_sql.call_count == 3
+
+
+class TestExportCurrentSchedule:
+
+    @use_test_database
+    def test_only_scheduled_projects(self):
+        pepe = Pycampista.create(username="pepe")
+        slot = Slot.create(code="B2", start=datetime(2024, 6, 22, 10, 0), current_wizard=pepe)
+        Project.create(name="Django", owner=pepe, topic="web", slot=slot)
+        Project.create(name="Flask", owner=pepe, topic="web")
+        assert export_current_schedule() == [("Django", "B2")]
@@ -89,6 +89,7 @@ class TestGrantAdmin:
         await grant_admin(update, context)
         user = Pycampista.get(Pycampista.username == "pepe")
         assert user.admin is True
+        assert is_admin(make_update(username="pepe"), make_context()) is True
         context.bot.send_message.assert_called_once()
         assert "poder" in context.bot.send_message.call_args[1]["text"]
 
@@ -132,6 +133,15 @@ class TestRevokeAdmin:
         fallen = Pycampista.get(Pycampista.username == "fallen")
         assert fallen.admin is False
 
+    @use_test_database_async
+    async def test_revoked_admin_is_no_longer_authorized(self):
+        Pycampista.create(username="admin1", admin=True)
+        Pycampista.create(username="fallen", admin=True)
+        assert is_admin(make_update(username="fallen"), make_context()) is True
+        update = make_update(text="/degradar fallen", username="admin1")
+        await revoke_admin(update, make_context())
+        assert is_admin(make_update(username="fallen"), make_context()) is False
+
     @use_test_database_async
     async def test_revoke_rejects_missing_parameter(self):
         Pycampista.create(username="admin1", admin=True)
@@ -1,11 +1,17 @@
-"""Tests para handlers de schedule.py: /cronogramear, /cronograma, /cambiar_slot."""
+"""
+Tests para handlers de schedule.py: /cronogramear, /cronograma, /cambiar_slot,
+/recronogramear.
+"""
+from unittest.mock import patch
+
 from telegram.ext import ConversationHandler
 from pycamp_bot.models import Pycampista, Pycamp, Slot, Project, Vote
 from pycamp_bot.commands.schedule import (
     define_slot_days, define_slot_ammount, define_slot_times, create_slot,
     make_schedule, show_schedule, change_slot, cancel, check_day_tab,
-    DAY_SLOT_TIME,
+    reschedule, DAY_SLOT_TIME,
 )
+from pycamp_bot.scheduler.schedule_calculator import ProgressEvent
 from test.conftest import (
     use_test_database_async, test_db, MODELS,
     make_update, make_context,
@@ -152,6 +158,159 @@ class TestCreateSlot:
         result = await create_slot(update, context)
         assert result == ConversationHandler.END
         assert "Asignados" in context.bot.send_message.call_args_list[0][1]["text"]
+        # El cálculo queda corriendo en segundo plano
+        await context.application.create_task.call_args[0][0]
+        assert "Generado" in context.bot.send_message.call_args[1]["text"]
+
+
+class TestMakeSchedule:
+
+    @use_test_database_async
+    async def test_acknowledges_and_computes_in_background(self):
+        owner = Pycampista.create(username="pepe")
+        Slot.create(code="A1", start=9)
+        Slot.create(code="A2", start=10)
+        Project.create(name="Proyecto1", owner=owner, topic="test")
+        Project.create(name="Proyecto2", owner=owner, topic="test")
+        update = make_update(text="9", username="pepe")
+        context = make_context()
+        await make_schedule(update, context)
+        assert "Generando" in context.bot.send_message.call_args[1]["text"]
+        assert Project.select().where(Project.slot.is_null(False)).count() == 0
+
+        await context.application.create_task.call_args[0][0]
+        assert "Generado" in context.bot.send_message.call_args[1]["text"]
+        slots = {project.name: project.slot.code for project in Project.select()}
+        # Mismo responsable: no pueden compartir slot
+        assert slots["Proyecto1"] != slots["Proyecto2"]
+
+    @use_test_database_async
+    async def test_logs_progress(self):
+        def fake_schedule(problem, progress_callback):
+            progress_callback(ProgressEvent(0, -10.0, 0.5, 100))
+            progress_callback(ProgressEvent(1, -5.0, 0.6, 200))  # throttled
+            return []
+
+        update = make_update(text="9", username="pepe")
+        context = make_context()
+        with patch("pycamp_bot.commands.schedule.schedule_problem", fake_schedule), \
+                patch("pycamp_bot.commands.schedule.logger") as logger:
+            await make_schedule(update, context)
+            await context.application.create_task.call_args[0][0]
+        assert logger.info.call_count == 1
+        assert logger.info.call_args[0][1:] == (0, -10.0, 0.5, 100)
+
+    @use_test_database_async
+    async def test_reports_failures(self):
+        update = make_update(text="9", username="pepe")
+        context = make_context()
+        with patch("pycamp_bot.commands.schedule.schedule_problem",
+                   side_effect=RuntimeError("boom")):
+            await make_schedule(update, context)
+            await context.application.create_task.call_args[0][0]
+        assert "No se pudo" in context.bot.send_message.call_args[1]["text"]
+        assert "schedule_running" not in context.bot_data
+
+    @use_test_database_async
+    async def test_skips_rows_deleted_while_computing(self):
+        owner = Pycampista.create(username="pepe")
+        Slot.create(code="A1", start=9)
+        Project.create(name="Proyecto1", owner=owner, topic="test")
+        schedule = [("Proyecto1", "A1"), ("Borrado", "A1"), ("Proyecto1", "B1")]
+        update = make_update(text="9", username="pepe")
+        context = make_context()
+        with patch("pycamp_bot.commands.schedule.schedule_problem",
+                   return_value=schedule):
+            await make_schedule(update, context)
+            await context.application.create_task.call_args[0][0]
+        text = context.bot.send_message.call_args[1]["text"]
+        assert "Generado" in text
+        assert "2 asignaciones se descartaron" in text
+        assert Project.get(Project.name == "Proyecto1").slot.code == "A1"
+
+    @use_test_database_async
+    async def test_rejects_while_another_schedule_runs(self):
+        update = make_update(text="9", username="pepe")
+        context = make_context()
+        with patch("pycamp_bot.commands.schedule.schedule_problem", return_value=[]):
+            await make_schedule(update, context)
+            await make_schedule(update, context)
+            assert context.application.create_task.call_count == 1
+            assert "Ya se está generando" in context.bot.send_message.call_args[1]["text"]
+
+            await context.application.create_task.call_args[0][0]
+            await make_schedule(update, context)
+            assert context.application.create_task.call_count == 2
+            await context.application.create_task.call_args[0][0]
+
+
+class TestReschedule:
+
+    @use_test_database_async
+    async def test_keeps_scheduled_projects_and_places_new_ones(self):
+        admin = Pycampista.create(username="admin1", admin=True)
+        ana = Pycampista.create(username="ana")
+        slot_a1 = Slot.create(code="A1", start=9)
+        slot_a2 = Slot.create(code="A2", start=10)
+        Project.create(name="Proyecto1", owner=admin, topic="test", slot=slot_a1)
+        Project.create(name="Proyecto2", owner=ana, topic="web", slot=slot_a2)
+        Project.create(name="Nuevo", owner=admin, topic="test")
+        update = make_update(text="/recronogramear", username="admin1")
+        context = make_context()
+        await reschedule(update, context)
+        assert "Actualizando" in context.bot.send_message.call_args[1]["text"]
+
+        await context.application.create_task.call_args[0][0]
+        text = context.bot.send_message.call_args[1]["text"]
+        assert "0 proyectos cambiaron de slot, 1 proyectos nuevos" in text
+        slots = {project.name: project.slot.code for project in Project.select()}
+        assert slots == {"Proyecto1": "A1", "Proyecto2": "A2", "Nuevo": "A2"}
+
+    @use_test_database_async
+    async def test_counts_moved_and_new_projects_apart(self):
+        admin = Pycampista.create(username="admin1", admin=True)
+        slot_a1 = Slot.create(code="A1", start=9)
+        Slot.create(code="A2", start=10)
+        Project.create(name="Quieto", owner=admin, topic="test", slot=slot_a1)
+        Project.create(name="Movido", owner=admin, topic="test", slot=slot_a1)
+        Project.create(name="Nuevo", owner=admin, topic="test")
+        schedule = [("Quieto", "A1"), ("Movido", "A2"), ("Nuevo", "A2")]
+        update = make_update(text="/recronogramear", username="admin1")
+        context = make_context()
+        with patch("pycamp_bot.commands.schedule.reschedule_problem",
+                   return_value=schedule):
+            await reschedule(update, context)
+            await context.application.create_task.call_args[0][0]
+        text = context.bot.send_message.call_args[1]["text"]
+        assert "1 proyectos cambiaron de slot, 1 proyectos nuevos" in text
+
+    @use_test_database_async
+    async def test_rejects_without_schedule(self):
+        Pycampista.create(username="admin1", admin=True)
+        update = make_update(text="/recronogramear", username="admin1")
+        context = make_context()
+        await reschedule(update, context)
+        assert "No hay cronograma" in context.bot.send_message.call_args[1]["text"]
+        context.application.create_task.assert_not_called()
+
+    @use_test_database_async
+    async def test_rejects_while_another_schedule_runs(self):
+        Pycampista.create(username="admin1", admin=True)
+        Slot.create(code="A1", start=9)
+        update = make_update(text="/recronogramear", username="admin1")
+        context = make_context()
+        context.bot_data["schedule_running"] = True
+        await reschedule(update, context)
+        assert "Ya se está generando" in context.bot.send_message.call_args[1]["text"]
+        context.application.create_task.assert_not_called()
+
+    @use_test_database_async
+    async def test_non_admin_is_blocked(self):
+        Pycampista.create(username="user1", admin=False)
+        update = make_update(text="/recronogramear", username="user1")
+        context = make_context()
+        await reschedule(update, context)
+        assert "No estas Autorizadx" in context.bot.send_message.call_args[1]["text"]
 
 
 class TestShowSchedule:
@@ -1,4 +1,5 @@
 import peewee
+from unittest.mock import patch
 from pycamp_bot.models import Pycampista, Pycamp, Project, Vote
 from pycamp_bot.commands.voting import (
     start_voting, end_voting, vote, button, vote_count,
@@ -55,6 +56,19 @@ class TestEndVoting:
         pycamp = Pycamp.get(Pycamp.active == True)
         assert pycamp.vote_authorized is False
 
+    @use_test_database_async
+    async def test_reads_active_pycamp_once(self):
+        Pycampista.create(username="admin1", admin=True)
+        Pycamp.create(headquarters="Narnia", active=True, vote_authorized=True)
+        update = make_update(text="/terminar_votacion_proyectos", username="admin1")
+        context = make_context()
+        execute_sql = test_db.execute_sql
+        with patch.object(test_db, "execute_sql", side_effect=execute_sql) as spy:
+            await end_voting(update, context)
+        pycamp_reads = [call for call in spy.call_args_list
+                        if call.args[0].startswith('SELECT') and 'FROM "pycamp"' in call.args[0]]
+        assert len(pycamp_reads) == 1
+
 
 class TestVote:
 
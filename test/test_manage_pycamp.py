@@ -1,4 +1,5 @@
 import datetime as dt
+from unittest.mock import patch
 from pycamp_bot.models import Pycamp
 from pycamp_bot.commands.manage_pycamp import get_pycamp_by_name, get_active_pycamp
 from test.conftest import use_test_database, test_db, MODELS
@@ -65,6 +66,36 @@ class TestGetActivePycamp:
         is_active, pycamp = get_active_pycamp()
         assert is_active is False
 
+    @use_test_database
+    def test_active_pycamp_is_read_once(self):
+        Pycamp.create(headquarters="Narnia", active=True)
+        execute_sql = test_db.execute_sql
+        with patch.object(test_db, "execute_sql", side_effect=execute_sql) as spy:
+            for _ in range(3):
+                is_active, pycamp = get_active_pycamp()
+                assert pycamp.headquarters == "Narnia"
+        assert spy.call_count == 1
+
+    @use_test_database
+    def test_set_as_only_active_refreshes_active_pycamp(self):
+        Pycamp.create(headquarters="Narnia", active=True)
+        mordor = Pycamp.create(headquarters="Mordor")
+        assert get_active_pycamp()[1].headquarters == "Narnia"
+        mordor.set_as_only_active()
+        assert get_active_pycamp()[1].headquarters == "Mordor"
+
+    @use_test_database
+    def test_saving_a_pycamp_refreshes_active_pycamp(self):
+        Pycamp.create(headquarters="Narnia", active=True)
+        narnia = Pycamp.get(Pycamp.headquarters == "Narnia")
+        assert get_active_pycamp()[1].vote_authorized is False
+        narnia.vote_authorized = True
+        narnia.save()
+        assert get_active_pycamp()[1].vote_authorized is True
+        narnia.active = False
+        narnia.save()
+        assert get_active_pycamp() == (False, None)
+
 
 class TestPycampDurationCalculation:
 
@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 import peewee
 from pycamp_bot.models import (
     Pycamp, Pycampista, PycampistaAtPycamp, WizardAtPycamp,
-    Slot, Project, Vote, DEFAULT_SLOT_PERIOD,
+    Slot, Project, Vote, DEFAULT_SLOT_PERIOD, cached, invalidate,
 )
 from test.conftest import use_test_database, test_db, MODELS
 
@@ -233,3 +233,64 @@ class TestVoteModel:
             _project_pycampista_id=f"{project.id}-{voter.id}",
         )
         assert vote.interest is None
+
+
+class TestLookupIndexes:
+
+    @staticmethod
+    def _query_plan(query):
+        sql, params = query.sql()
+        plan = test_db.execute_sql('EXPLAIN QUERY PLAN ' + sql, params)
+        return ' '.join(row[-1] for row in plan)
+
+    @use_test_database
+    def test_interested_votes_of_project_use_index(self):
+        query = Vote.select().where((Vote.project == 1) & (Vote.interest == True))
+        assert 'vote_project_id_interest' in self._query_plan(query)
+
+    @use_test_database
+    def test_interested_votes_of_pycampista_use_index(self):
+        query = Vote.select().where((Vote.pycampista == 1) & (Vote.interest == True))
+        assert 'vote_pycampista_id_interest' in self._query_plan(query)
+
+    @use_test_database
+    def test_current_wizard_uses_index(self):
+        now = datetime(2024, 6, 21, 10, 0)
+        query = WizardAtPycamp.select().where(
+            (WizardAtPycamp.pycamp == 1) &
+            (WizardAtPycamp.init <= now) &
+            (WizardAtPycamp.end > now)
+        )
+        assert 'wizardatpycamp_pycamp_id_init_end' in self._query_plan(query)
+
+    @use_test_database
+    def test_admins_use_index(self):
+        query = Pycampista.select(Pycampista.username).where(Pycampista.admin == True)
+        assert 'pycampista_admin' in self._query_plan(query)
+
+    @use_test_database
+    def test_slot_by_code_uses_index(self):
+        query = Slot.select().where(Slot.code == "A1")
+        assert 'slot_code' in self._query_plan(query)
+
+
+class TestModelCache:
+
+    def test_loads_once_until_invalidated(self):
+        loads = []
+        assert cached("answer", lambda: loads.append(1) or 42) == 42
+        assert cached("answer", lambda: loads.append(1) or 42) == 42
+        assert len(loads) == 1
+        invalidate(["answer"])
+        cached("answer", lambda: loads.append(1) or 42)
+        assert len(loads) == 2
+
+    @use_test_database
+    def test_writes_only_drop_the_keys_of_their_model(self):
+        Pycamp.create(headquarters="Narnia", active=True)
+        active = Pycamp.get_active()
+        owner = Pycampista.create(username="pepe")
+        Project.create(name="Proyecto1", owner=owner)
+        assert Pycamp.get_active() is active
+        Pycamp.get_by_id(active.id).save()
+        assert Pycamp.get_active() is not active
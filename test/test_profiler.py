@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from pycamp_bot.scheduler.profiler import COST_TERMS, cost_breakdown, format_report, profile
+from pycamp_bot.scheduler.schedule_calculator import (
+    IMPOSIBLE_COST, ProjectSpec, PyCampScheduleProblem,
+)
+from test.test_scheduler import _load_data_example
+
+
+class TestCostBreakdown:
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_terms_add_up_to_value(self, seed):
+        data = _load_data_example()
+        problem = PyCampScheduleProblem(data, same_theme_weight=2.0, most_voted_weight=0.5)
+        state = problem.generate_random_state(random.Random(seed))
+        costs = cost_breakdown(problem, state)
+        assert list(costs) == list(COST_TERMS)
+        assert sum(costs.values()) == pytest.approx(-problem.value(state), abs=1e-6)
+
+    def test_availability_and_priority(self):
+        projects = [ProjectSpec("Django", ("pepe",), (), 1, "web", priority_slots=("A1",))]
+        problem = PyCampScheduleProblem.from_specs(projects, ["A1", "A2"], {"pepe": ["A1"]})
+        costs = cost_breakdown(problem, [("Django", "A2")])
+        assert costs["responsable_not_available"] == IMPOSIBLE_COST
+        assert costs["not_in_priority_slot"] == 10
+        assert cost_breakdown(problem, [("Django", "A1")])["not_in_priority_slot"] == 0
+
+
+class TestProfile:
+
+    def test_reports_solve(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state, report = profile(problem, seed=0, repeats=2, max_iters=2)
+        assert problem.neighbourhood_sizes is None
+        assert report["evaluations"] > 0
+        assert report["evaluations_per_second"] > 0
+        sizes = report["neighbourhood_sizes"]
+        assert sizes and all(size > 0 for size in sizes)
+        assert set(report["terms"]) == set(COST_TERMS)
+        total = sum(term["cost"] for term in report["terms"].values())
+        assert total == pytest.approx(-problem.value(state), abs=1e-6)
+
+    def test_format_report(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        _, report = profile(problem, seed=0, repeats=1, max_iters=1)
+        text = format_report(report)
+        assert "evaluations" in text
+        for name in COST_TERMS:
+            assert name in text
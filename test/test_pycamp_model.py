@@ -1,4 +1,5 @@
 from datetime import datetime
+from unittest.mock import patch
 from freezegun import freeze_time
 from pycamp_bot.models import Pycamp, Pycampista, WizardAtPycamp
 from pycamp_bot.commands import wizard
@@ -72,3 +73,75 @@ class TestPycampGetCurrentWizard:
         w = p.get_current_wizard()
         
         assert w == w1 or w == w2
+
+
+class TestPycampWizardAgenda:
+
+    def init_pycamp(self):
+        self.pycamp = Pycamp.create(
+            headquarters="Narnia",
+            init=datetime(2024, 6, 20),
+            end=datetime(2024, 6, 23),
+        )
+
+    @use_test_database
+    @freeze_time("2024-06-21 15:30:00")
+    def test_current_wizard_does_not_query_the_db_again(self):
+        self.init_pycamp()
+        pycamper = self.pycamp.add_wizard("pepe", 123)
+        wizard.persist_wizards_schedule_in_db(self.pycamp)
+        assert self.pycamp.get_current_wizard() == pycamper
+
+        execute_sql = test_db.execute_sql
+        with patch.object(test_db, "execute_sql", side_effect=execute_sql) as spy:
+            assert self.pycamp.get_current_wizard() == pycamper
+        assert spy.call_count == 0
+
+    @use_test_database
+    @freeze_time("2024-06-21 15:30:00")
+    def test_agenda_is_reloaded_when_rescheduled(self):
+        self.init_pycamp()
+        gandalf = self.pycamp.add_wizard("gandalf", 123)
+        wizard.persist_wizards_schedule_in_db(self.pycamp)
+        assert self.pycamp.get_current_wizard() == gandalf
+
+        self.pycamp.clear_wizards_schedule()
+        assert self.pycamp.get_current_wizard() is None
+
+        merlin = Pycampista.create(username="merlin", wizard=False)
+        WizardAtPycamp.create(
+            pycamp=self.pycamp,
+            wizard=merlin,
+            init=datetime(2024, 6, 21, 12, 0),
+            end=datetime(2024, 6, 21, 13, 0),
+        )
+        assert self.pycamp.get_current_wizard() == merlin
+
+    @use_test_database
+    def test_agenda_is_sorted_by_init(self):
+        self.init_pycamp()
+        gandalf = self.pycamp.add_wizard("gandalf", 123)
+        for hour in [15, 9, 11]:
+            WizardAtPycamp.create(
+                pycamp=self.pycamp,
+                wizard=gandalf,
+                init=datetime(2024, 6, 21, hour, 0),
+                end=datetime(2024, 6, 21, hour + 1, 0),
+            )
+        inits, max_ends, entries = self.pycamp.get_wizard_agenda()
+        assert inits == [datetime(2024, 6, 21, hour, 0) for hour in [9, 11, 15]]
+        assert max_ends == [datetime(2024, 6, 21, hour + 1, 0) for hour in [9, 11, 15]]
+        assert [w for _, _, w in entries] == [gandalf] * 3
+
+    @use_test_database
+    def test_pycampista_changes_reload_the_agenda(self):
+        self.init_pycamp()
+        gandalf = self.pycamp.add_wizard("gandalf", 123)
+        wizard.persist_wizards_schedule_in_db(self.pycamp)
+        _, _, entries = self.pycamp.get_wizard_agenda()
+        assert entries[0][2].chat_id == "123"
+
+        gandalf.chat_id = "456"
+        gandalf.save()
+        _, _, entries = self.pycamp.get_wizard_agenda()
+        assert entries[0][2].chat_id == "456"
@@ -0,0 +1,112 @@
+import os
+
+from pycamp_bot.scheduler import schedule_calculator
+from pycamp_bot.scheduler.cache import ScheduleCache, default_cache, schedule_key
+from pycamp_bot.scheduler.schedule_calculator import ProjectSpec, PyCampScheduleProblem
+
+
+def _make_problem(reverse=False):
+    projects = [
+        ProjectSpec("Django", ("pepe",), ("ana", "juan"), 1, "web"),
+        ProjectSpec("Flask", ("ana",), ("juan", "pepe"), 2, "web"),
+    ]
+    if reverse:
+        projects = [project._replace(votes=project.votes[::-1]) for project in projects[::-1]]
+    return PyCampScheduleProblem.from_specs(projects, ["A1", "A2"])
+
+
+class TestScheduleKey:
+
+    def test_ignores_projects_and_votes_order(self):
+        assert (schedule_key(_make_problem(), "hill_climbing", 1, {}) ==
+                schedule_key(_make_problem(reverse=True), "hill_climbing", 1, {}))
+
+    def test_depends_on_solver_parameters(self):
+        problem = _make_problem()
+        key = schedule_key(problem, "hill_climbing", 1, {"time_budget": 10})
+        assert key != schedule_key(problem, "tabu_search", 1, {"time_budget": 10})
+        assert key != schedule_key(problem, "hill_climbing", 2, {"time_budget": 10})
+        assert key != schedule_key(problem, "hill_climbing", 1, {"time_budget": 5})
+
+    def test_depends_on_weights(self):
+        other = PyCampScheduleProblem.from_specs(
+            _make_problem().projects, ["A1", "A2"], same_theme_weight=2.0)
+        assert (schedule_key(_make_problem(), "hill_climbing", 1, {}) !=
+                schedule_key(other, "hill_climbing", 1, {}))
+
+
+class TestScheduleCache:
+
+    def test_put_and_get(self, tmp_path):
+        cache = ScheduleCache(str(tmp_path))
+        assert cache.get("abc") is None
+        cache.put("abc", [("Django", "A1"), ("Flask", "A2")])
+        assert cache.get("abc") == [("Django", "A1"), ("Flask", "A2")]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ScheduleCache(str(tmp_path), max_entries=2)
+        cache.put("a", [])
+        cache.put("b", [])
+        os.utime(tmp_path / "a.json", (1000, 1000))
+        os.utime(tmp_path / "b.json", (2000, 2000))
+        assert cache.get("a") == []
+        cache.put("c", [])
+        assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+
+    def test_put_ignores_unwritable_directory(self, tmp_path):
+        (tmp_path / "file").write_text("")
+        cache = ScheduleCache(str(tmp_path / "file" / "cache"))
+        assert cache.put("abc", [("Django", "A1")]) == [("Django", "A1")]
+        assert cache.get("abc") is None
+
+    def test_default_cache_uses_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("PYCAMP_SCHEDULER_CACHE_DIR", str(tmp_path))
+        assert default_cache().directory == str(tmp_path)
+        assert default_cache() is default_cache()
+
+
+class TestSchedulerUsesCache:
+
+    def test_identical_request_is_not_solved_again(self, monkeypatch):
+        calls = []
+        solve = schedule_calculator.solve
+
+        def counting_solve(*args, **kwargs):
+            calls.append(args)
+            return solve(*args, **kwargs)
+
+        monkeypatch.setattr(schedule_calculator, "solve", counting_solve)
+        first = schedule_calculator.schedule_problem(_make_problem(), workers=1, seed=3)
+        second = schedule_calculator.schedule_problem(
+            _make_problem(reverse=True), workers=1, seed=3)
+        assert len(calls) == 1
+        assert sorted(first) == sorted(second)
+
+        schedule_calculator.schedule_problem(_make_problem(), workers=1, seed=3, use_cache=False)
+        assert len(calls) == 2
+
+    def test_depends_on_workers(self, monkeypatch):
+        calls = []
+        solve = schedule_calculator.solve
+
+        def counting_solve(*args, **kwargs):
+            calls.append(kwargs["workers"])
+            return solve(*args, **kwargs)
+
+        monkeypatch.setattr(schedule_calculator, "solve", counting_solve)
+        monkeypatch.setenv("PYCAMP_SCHEDULER_WORKERS", "2")
+        schedule_calculator.schedule_problem(_make_problem(), solver="simulated_annealing",
+                                             seed=3, time_budget=1)
+        schedule_calculator.schedule_problem(_make_problem(), solver="simulated_annealing",
+                                             workers=2, seed=3, time_budget=1)
+        schedule_calculator.schedule_problem(_make_problem(), solver="simulated_annealing",
+                                             workers=1, seed=3, time_budget=1)
+        assert calls == [2, 1]
+
+    def test_unwritable_cache_does_not_fail_the_solve(self, tmp_path, monkeypatch):
+        (tmp_path / "file").write_text("")
+        monkeypatch.setenv("PYCAMP_SCHEDULER_CACHE_DIR", str(tmp_path / "file" / "cache"))
+        state = schedule_calculator.schedule_problem(_make_problem(), workers=1, seed=3)
+        assert sorted(state) == sorted(
+            schedule_calculator.schedule_problem(_make_problem(), workers=1, seed=3))
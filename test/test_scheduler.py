@@ -1,10 +1,47 @@
+import json
+import os
+import random
+import time
+from itertools import combinations
+
+import pytest
+
+from pycamp_bot.constants import SCHEDULER_TIME_BUDGET_ENVVAR, SCHEDULER_WORKERS_ENVVAR
+from pycamp_bot.scheduler.benchmark.generator import generate_instance
 from pycamp_bot.scheduler.schedule_calculator import (
+    ProjectSpec,
     PyCampScheduleProblem,
+    ScheduleEvaluator,
+    DEFAULT_TIME_BUDGET,
+    SOLVERS,
+    default_time_budget,
+    default_workers,
+    export_scheduled_result,
     hill_climbing,
+    random_restart_hill_climbing,
+    repair,
+    reschedule_problem,
+    restart,
+    schedule_problem,
     IMPOSIBLE_COST,
+    ProgressEvent,
+    throttle,
 )
 
 
+DATA_EXAMPLE = os.path.join(os.path.dirname(__file__), 'data', 'data_example.json')
+
+
+def _load_data_example():
+    """Datos reales de un PyCamp, con disponibilidad parcial de responsables."""
+    with open(DATA_EXAMPLE) as f:
+        data = json.load(f)
+    # Algunos proyectos con slots prioritarios para cubrir ese costo
+    for project in list(data["projects"].values())[:3]:
+        project["priority_slots"] = data["available_slots"][:2]
+    return data
+
+
 def _make_problem_data(projects=None, slots=None):
     """Helper para crear datos de problema de scheduling."""
     if slots is None:
@@ -69,6 +106,37 @@ class TestPyCampScheduleProblemInit:
         assert problem.total_participants == len(all_voters)
 
 
+class TestFromSpecs:
+
+    def test_matches_json_problem(self):
+        data = _make_problem_data()
+        specs = [
+            ProjectSpec(name=name, responsables=tuple(project["responsables"]),
+                        votes=tuple(project["votes"]), difficult_level=project["difficult_level"],
+                        theme=project["theme"])
+            for name, project in data["projects"].items()
+        ]
+        problem = PyCampScheduleProblem.from_specs(specs, data["available_slots"])
+        from_json = PyCampScheduleProblem(data)
+        assert problem.data is None
+        assert problem.pair_costs == from_json.pair_costs
+        assert problem.project_costs == from_json.project_costs
+        assert problem.total_participants == from_json.total_participants
+
+    def test_responsables_added_to_votes(self):
+        specs = [ProjectSpec(name="p", responsables=("pepe",), votes=("juan",),
+                             difficult_level=1, theme="web")]
+        problem = PyCampScheduleProblem.from_specs(specs, ["A1"])
+        assert problem.projects[0].votes == ("juan", "pepe")
+        assert problem.votes_counts == [2]
+
+    def test_availability(self):
+        specs = [ProjectSpec(name="p", responsables=("pepe",), votes=(),
+                             difficult_level=1, theme="web")]
+        problem = PyCampScheduleProblem.from_specs(specs, ["A1", "A2"], {"pepe": ["A2"]})
+        assert problem.project_costs == [[IMPOSIBLE_COST, 0]]
+
+
 class TestGenerateRandomState:
 
     def test_returns_all_projects(self):
@@ -123,6 +191,28 @@ class TestNeighboors:
         assert len(neighbors) == 7
 
 
+class TestNeighbourMoves:
+
+    def test_matches_neighboors(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_random_state()
+        evaluator = ScheduleEvaluator(problem, state)
+        moves = list(evaluator.neighbour_moves())
+        neighbors = problem.neighboors(state)
+        assert len(moves) == len(neighbors)
+        for (move, delta), neighbor in zip(moves, neighbors):
+            expected = problem.value(neighbor) - problem.value(state)
+            assert delta == pytest.approx(expected, abs=1e-6)
+
+    def test_does_not_change_state(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_random_state()
+        evaluator = ScheduleEvaluator(problem, state)
+        for _ in evaluator.neighbour_moves():
+            pass
+        assert evaluator.state() == state
+
+
 class TestValue:
 
     def test_no_collisions_returns_negative_value(self):
@@ -252,6 +342,15 @@ class TestHillClimbing:
         for neighbor in problem.neighboors(result):
             assert problem.value(neighbor) <= result_value
 
+    def test_first_improvement_reaches_local_optimum(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        initial = problem.generate_random_state()
+        result = hill_climbing(problem, initial, first_improvement=True)
+        result_value = problem.value(result)
+        assert result_value >= problem.value(initial)
+        evaluator = ScheduleEvaluator(problem, result)
+        assert all(delta <= 1e-6 for _, delta in evaluator.neighbour_moves())
+
     def test_improves_or_maintains_initial_value(self):
         data = _make_problem_data()
         problem = PyCampScheduleProblem(data)
@@ -259,3 +358,448 @@ class TestHillClimbing:
         initial_value = problem.value(initial)
         result = hill_climbing(problem, initial)
         assert problem.value(result) >= initial_value
+
+
+class TestScheduleEvaluator:
+
+    def test_initial_value_matches_value(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_random_state()
+        evaluator = ScheduleEvaluator(problem, state)
+        assert evaluator.value == pytest.approx(problem.value(state))
+
+    def test_move_delta_matches_value(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        random.seed(1)
+        state = problem.generate_random_state()
+        evaluator = ScheduleEvaluator(problem, state)
+        for i, project in enumerate(problem.project_list):
+            for slot_number, slot in enumerate(problem.slot_list):
+                new_state = dict(state)
+                new_state[project] = slot
+                expected = problem.value(list(new_state.items())) - problem.value(state)
+                assert evaluator.move_delta(i, slot_number) == pytest.approx(expected, abs=1e-6)
+
+    def test_swap_delta_matches_value(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        random.seed(2)
+        state = problem.generate_random_state()
+        evaluator = ScheduleEvaluator(problem, state)
+        for (proj1, slot1), (proj2, slot2) in combinations(state, 2):
+            new_state = dict(state)
+            new_state[proj1] = slot2
+            new_state[proj2] = slot1
+            expected = problem.value(list(new_state.items())) - problem.value(state)
+            i, j = problem.project_index[proj1], problem.project_index[proj2]
+            assert evaluator.swap_delta(i, j) == pytest.approx(expected, abs=1e-6)
+
+    def test_applied_moves_keep_value_in_sync(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        rng = random.Random(3)
+        evaluator = ScheduleEvaluator(problem, problem.generate_random_state())
+        projects = range(len(problem.project_list))
+        slots = range(len(problem.slot_list))
+        for _ in range(200):
+            if rng.random() < 0.5:
+                evaluator.apply_move(rng.choice(projects), rng.choice(slots))
+            else:
+                evaluator.apply_swap(*rng.sample(projects, 2))
+            assert evaluator.value == pytest.approx(problem.value(evaluator.state()), abs=1e-6)
+
+
+class TestConflictMatrices:
+
+    def test_indexes_follow_data_order(self):
+        data = _make_problem_data()
+        problem = PyCampScheduleProblem(data)
+        assert problem.project_index == {"proyecto1": 0, "proyecto2": 1}
+        assert problem.slot_index == {"A1": 0, "A2": 1, "B1": 2, "B2": 3}
+
+    def test_voters_overlap_matrix(self):
+        data = _make_problem_data()
+        problem = PyCampScheduleProblem(data)
+        # Solo "juan" vota ambos proyectos
+        assert problem.voters_overlap == [[0, 1], [1, 0]]
+
+    def test_voter_masks_match_set_intersections(self):
+        data = generate_instance(projects=40, voters=600, slots=10, vote_density=0.2, seed=2)
+        problem = PyCampScheduleProblem(data)
+        voters = [set(project.votes) for project in problem.projects]
+        assert problem.total_participants == len(set().union(*voters))
+        assert problem.votes_counts == [len(project_voters) for project_voters in voters]
+        for i, j in combinations(range(len(voters)), 2):
+            assert problem.voters_overlap[i][j] == len(voters[i] & voters[j])
+            assert problem.voters_overlap[j][i] == problem.voters_overlap[i][j]
+
+    def test_conflict_masks(self):
+        projects = {
+            "proyecto1": {
+                "responsables": ["pepe"], "votes": [], "difficult_level": 1,
+                "theme": "django", "priority_slots": [],
+            },
+            "proyecto2": {
+                "responsables": ["pepe"], "votes": [], "difficult_level": 1,
+                "theme": "flask", "priority_slots": [],
+            },
+        }
+        problem = PyCampScheduleProblem(_make_problem_data(projects=projects))
+        assert problem.responsables_conflict == [[False, True], [True, False]]
+        assert problem.same_level == [[False, True], [True, False]]
+        assert problem.same_theme == [[False, False], [False, False]]
+
+    def test_project_costs_include_availability_and_priority(self):
+        data = _make_problem_data()
+        data["responsable_available_slots"]["pepe"] = ["A1", "A2"]
+        data["projects"]["proyecto2"]["priority_slots"] = ["B2"]
+        problem = PyCampScheduleProblem(data)
+        assert problem.project_costs[0] == [0, 0, IMPOSIBLE_COST, IMPOSIBLE_COST]
+        assert problem.project_costs[1] == [10, 10, 10, 0]
+
+
+class TestRandomRestartHillClimbing:
+
+    def test_same_seed_same_result(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        first = random_restart_hill_climbing(problem, max_iters=6, seed=42)
+        second = random_restart_hill_climbing(problem, max_iters=6, seed=42)
+        assert first == second
+
+    def test_parallel_matches_sequential(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        sequential = random_restart_hill_climbing(problem, max_iters=6,
+                                                  max_iters_without_improvement=2, seed=7)
+        parallel = random_restart_hill_climbing(problem, max_iters=6,
+                                                max_iters_without_improvement=2,
+                                                workers=2, seed=7)
+        assert parallel == sequential
+
+    def test_restart_is_deterministic(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        assert restart(problem, 3, 1) == restart(problem, 3, 1)
+
+
+class TestDefaultWorkers:
+
+    def test_reads_environment(self, monkeypatch):
+        monkeypatch.setenv(SCHEDULER_WORKERS_ENVVAR, "3")
+        assert default_workers() == 3
+
+    def test_empty_environment_is_ignored(self, monkeypatch):
+        monkeypatch.setenv(SCHEDULER_WORKERS_ENVVAR, "")
+        monkeypatch.setattr(os, "cpu_count", lambda: 4)
+        assert default_workers() == 4
+
+    def test_defaults_to_cpu_count(self, monkeypatch):
+        monkeypatch.delenv(SCHEDULER_WORKERS_ENVVAR, raising=False)
+        monkeypatch.setattr(os, "cpu_count", lambda: 8)
+        assert default_workers() == 8
+
+
+class TestSolvers:
+
+    @pytest.mark.parametrize("name", ["hill_climbing", "simulated_annealing", "tabu_search"])
+    def test_solver_returns_complete_state(self, name):
+        data = _load_data_example()
+        problem = PyCampScheduleProblem(data)
+        state = SOLVERS[name](problem, seed=5)
+        assert sorted(project for project, _ in state) == sorted(data["projects"])
+        assert all(slot in data["available_slots"] for _, slot in state)
+
+    @pytest.mark.parametrize("name", ["simulated_annealing", "tabu_search"])
+    def test_sampling_solvers_are_deterministic(self, name):
+        problem = PyCampScheduleProblem(_load_data_example())
+        assert SOLVERS[name](problem, seed=5) == SOLVERS[name](problem, seed=5)
+
+    @pytest.mark.parametrize("name", ["simulated_annealing", "tabu_search"])
+    def test_sampling_solvers_avoid_impossible_costs(self, name):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = SOLVERS[name](problem, seed=5)
+        assert problem.value(state) > -IMPOSIBLE_COST
+
+    def test_export_selects_solver(self):
+        data = _make_problem_data()
+        state = export_scheduled_result(data, solver="tabu_search", workers=1, seed=1)
+        assert dict(state)["proyecto1"] != dict(state)["proyecto2"]
+
+    def test_random_move_changes_state(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        evaluator = ScheduleEvaluator(problem, problem.generate_random_state())
+        rng = random.Random(0)
+        for _ in range(100):
+            move = evaluator.random_move(rng)
+            assert all(old != new for _, old, new in evaluator.changes(move))
+
+
+class TestTimeBudget:
+
+    def test_default_time_budget(self, monkeypatch):
+        monkeypatch.delenv(SCHEDULER_TIME_BUDGET_ENVVAR, raising=False)
+        assert default_time_budget() == DEFAULT_TIME_BUDGET
+        monkeypatch.setenv(SCHEDULER_TIME_BUDGET_ENVVAR, "2.5")
+        assert default_time_budget() == 2.5
+
+    @pytest.mark.parametrize("name, options", [
+        ("hill_climbing", {"max_iters": 10 ** 6, "max_iters_without_improvement": 10 ** 6}),
+        ("simulated_annealing", {"max_steps": 10 ** 9}),
+        ("tabu_search", {"max_steps": 10 ** 9, "max_steps_without_improvement": 10 ** 9}),
+    ])
+    def test_solver_stops_at_time_budget(self, name, options):
+        problem = PyCampScheduleProblem(_load_data_example())
+        start = time.monotonic()
+        state = SOLVERS[name](problem, seed=5, time_budget=0.2, **options)
+        assert time.monotonic() - start < 2
+        assert len(state) == len(problem.project_list)
+
+    @pytest.mark.parametrize("name", ["hill_climbing", "simulated_annealing", "tabu_search"])
+    def test_progress_callback_reports_improvements(self, name):
+        problem = PyCampScheduleProblem(_load_data_example())
+        events = []
+        state = SOLVERS[name](problem, seed=5, progress_callback=events.append)
+        assert all(isinstance(event, ProgressEvent) for event in events)
+        values = [event.best_value for event in events]
+        assert values == sorted(values)
+        assert values[-1] == pytest.approx(problem.value(state), abs=1e-6)
+        for field in ("iteration", "elapsed", "evaluations"):
+            progress = [getattr(event, field) for event in events]
+            assert progress == sorted(progress)
+        assert events[-1].evaluations > 0
+
+    @pytest.mark.parametrize("name, options", [
+        ("hill_climbing", {"max_iters": 4}),
+        ("simulated_annealing", {"max_steps": 1000}),
+        ("tabu_search", {"max_steps": 100}),
+    ])
+    def test_progress_counts_worker_evaluations(self, name, options):
+        problem = PyCampScheduleProblem(_load_data_example())
+        events = []
+        SOLVERS[name](problem, workers=2, seed=5, progress_callback=events.append, **options)
+        assert events[-1].evaluations > 0
+        assert problem.evaluations >= events[-1].evaluations
+
+    def test_hill_climbing_reports_every_restart(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        events = []
+        random_restart_hill_climbing(problem, seed=5, max_iters=4,
+                                     max_iters_without_improvement=10,
+                                     progress_callback=events.append)
+        assert [event.iteration for event in events] == [0, 1, 2, 3]
+
+    def test_hill_climbing_does_not_print(self, capsys):
+        problem = PyCampScheduleProblem(_load_data_example())
+        random_restart_hill_climbing(problem, seed=5, max_iters=3)
+        assert capsys.readouterr().out == ""
+
+    def test_throttle(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        events = []
+        throttled = throttle(events.append, 5)
+        for second in range(12):
+            now[0] = second
+            throttled(second)
+        assert events == [0, 5, 10]
+
+    def test_expired_deadline_returns_initial_state(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        initial = problem.generate_random_state()
+        assert hill_climbing(problem, initial, deadline=time.monotonic()) == initial
+
+
+class TestMemo:
+
+    def test_fingerprint_ignores_order(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_random_state(random.Random(0))
+        assert problem.fingerprint(state) == problem.fingerprint(state[::-1])
+        project, slot = state[0]
+        other_slot = next(s for s in problem.slot_list if s != slot)
+        assert problem.fingerprint(state) != problem.fingerprint(
+            [(project, other_slot)] + state[1:])
+
+    def test_memoized_values_match(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        states = [problem.generate_random_state(random.Random(seed)) for seed in range(5)]
+        expected = [problem.value(state) for state in states]
+        problem.enable_memo()
+        assert [problem.value(state) for state in states] == expected
+        evaluations = problem.evaluations
+        assert [problem.value(state[::-1]) for state in states] == expected
+        assert problem.evaluations == evaluations
+        assert (problem.memo_hits, problem.memo_misses) == (5, 5)
+        assert problem.memo_hit_rate() == 0.5
+
+    def test_evicts_least_recently_used(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        problem.enable_memo(max_entries=2)
+        first, second, third = (problem.generate_random_state(random.Random(seed))
+                                for seed in range(3))
+        problem.value(first)
+        problem.value(second)
+        problem.value(first)
+        problem.value(third)
+        assert list(problem.memo) == [problem.fingerprint(first), problem.fingerprint(third)]
+
+    def test_disabled_by_default(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_random_state()
+        problem.value(state)
+        problem.value(state)
+        assert problem.memo is None
+        assert problem.memo_hit_rate() == 0.0
+
+
+class TestDsaturState:
+
+    def test_assigns_every_project_in_order(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_dsatur_state(random.Random(0))
+        assert [project for project, _ in state] == problem.project_list
+        assert all(slot in problem.slot_list for _, slot in state)
+
+    def test_same_rng_same_state(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        assert (problem.generate_dsatur_state(random.Random(1)) ==
+                problem.generate_dsatur_state(random.Random(1)))
+
+    def test_avoids_impossible_costs(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_dsatur_state(random.Random(0))
+        assert problem.value(state) > -IMPOSIBLE_COST
+        random_state = problem.generate_random_state(random.Random(0))
+        assert problem.value(state) > problem.value(random_state)
+
+    def test_separates_conflicting_projects(self):
+        projects = [
+            ProjectSpec("Django", ("pepe",), ("ana", "juan"), 1, "web"),
+            ProjectSpec("Flask", ("pepe",), ("ana",), 2, "web"),
+            ProjectSpec("Numpy", ("luis",), ("juan",), 3, "ciencia"),
+        ]
+        problem = PyCampScheduleProblem.from_specs(projects, ["A1", "A2", "A3"])
+        slots = [slot for _, slot in problem.generate_dsatur_state(random.Random(0))]
+        assert len(set(slots)) == 3
+
+    @pytest.mark.parametrize("name", ["hill_climbing", "simulated_annealing", "tabu_search"])
+    def test_solvers_accept_initial_state(self, name):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = SOLVERS[name](problem, seed=1, initial_state="dsatur", time_budget=0.5)
+        assert sorted(project for project, _ in state) == sorted(problem.project_list)
+        assert problem.value(state) > -IMPOSIBLE_COST
+
+
+class TestDecompose:
+
+    def _make_problem(self):
+        projects = [
+            ProjectSpec("Django", ("pepe",), ("ana",), 1, "web"),
+            ProjectSpec("Solo", ("luis",), (), 3, "juegos"),
+            ProjectSpec("Flask", ("juan",), ("ana",), 1, "web"),
+            ProjectSpec("Numpy", ("pepe",), (), 2, "ciencia"),
+        ]
+        problem = PyCampScheduleProblem.from_specs(projects, ["A1", "A2", "A3"])
+        problem.decompose()
+        return problem
+
+    def test_components_of_conflict_graph(self):
+        problem = self._make_problem()
+        # Django-Flask comparten votante, nivel y tema, Django-Numpy responsable
+        assert problem.components == [[0, 2, 3], [1]]
+        assert problem.component_of == [0, 1, 0, 0]
+        assert problem.search_order == [0, 2, 3, 1]
+        assert problem.swap_pairs == [(0, 2), (0, 3), (2, 3)]
+
+    def test_only_swaps_inside_components(self):
+        problem = self._make_problem()
+        state = [("Django", "A1"), ("Solo", "A2"), ("Flask", "A3"), ("Numpy", "A2")]
+        evaluator = ScheduleEvaluator(problem, state)
+        swaps = [move for move, _ in evaluator.neighbour_moves() if move[0] == "swap"]
+        assert swaps == [("swap", 0, 2), ("swap", 0, 3), ("swap", 2, 3)]
+        rng = random.Random(0)
+        for _ in range(200):
+            kind, i, target = evaluator.random_move(rng)
+            if kind == "swap":
+                assert problem.component_of[i] == problem.component_of[target]
+
+    def test_links_projects_with_pair_costs(self):
+        projects = [
+            ProjectSpec("Django", ("pepe",), (), 1, "web"),
+            ProjectSpec("Flask", ("juan",), (), 1, "ciencia"),
+        ]
+        problem = PyCampScheduleProblem.from_specs(projects, ["A1", "A2"])
+        problem.decompose()
+        assert problem.components == [[0, 1]]
+
+        problem = PyCampScheduleProblem.from_specs(projects, ["A1", "A2"], same_levels_weight=0)
+        problem.decompose()
+        assert problem.components == [[0], [1]]
+
+    def test_neighbour_moves_match_neighboors(self):
+        problem = PyCampScheduleProblem(generate_instance(
+            projects=20, voters=100, slots=6, vote_density=0.01, responsables=20),
+            same_levels_weight=0, same_theme_weight=0)
+        problem.decompose()
+        assert len(problem.components) > 1
+        state = problem.generate_random_state(random.Random(0))
+        evaluator = ScheduleEvaluator(problem, state)
+        moves = list(evaluator.neighbour_moves())
+        neighbors = problem.neighboors(state)
+        assert len(moves) == len(neighbors)
+        for (move, delta), neighbor in zip(moves, neighbors):
+            expected = problem.value(neighbor) - problem.value(state)
+            assert delta == pytest.approx(expected, abs=1e-6)
+
+    def test_schedule_problem_does_not_decompose_by_default(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = schedule_problem(problem, workers=1, seed=0, max_iters=2)
+        assert problem.components is None
+        assert len(state) == len(problem.project_list)
+
+    def test_schedule_problem_decomposes_on_request(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = schedule_problem(problem, workers=1, seed=0, max_iters=2, decompose=True)
+        assert problem.components is not None
+        assert len(state) == len(problem.project_list)
+
+
+class TestReschedule:
+
+    def test_penalize_moves_only_other_slots(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        project, slot = problem.project_list[0], problem.slot_list[1]
+        before = [row[:] for row in problem.project_costs]
+        problem.penalize_moves([(project, slot), ("Borrado", slot)], moved_project_weight=2)
+        for s, cost in enumerate(problem.project_costs[0]):
+            expected = before[0][s] + (0 if s == 1 else 20)
+            assert cost == expected
+        assert problem.project_costs[1:] == before[1:]
+
+    def test_insert_delta_matches_full_value(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        state = problem.generate_random_state(random.Random(3))
+        evaluator = ScheduleEvaluator(problem, state[1:])
+        i = problem.project_index[state[0][0]]
+        for slot in range(len(problem.slot_list)):
+            expected = problem.value(state[1:] + [(state[0][0], problem.slot_list[slot])])
+            assert evaluator.value + evaluator.insert_delta(i, slot) == pytest.approx(
+                expected, abs=1e-6)
+        evaluator.apply_insert(i, 0)
+        assert evaluator.value == pytest.approx(problem.value(evaluator.state()), abs=1e-6)
+
+    def test_repair_places_missing_projects(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        current = problem.generate_random_state(random.Random(1))[2:]
+        state = repair(problem, current + [("Borrado", "A1")], max_steps=0)
+        assert state[:len(current)] == current
+        assert sorted(project for project, _ in state) == sorted(problem.project_list)
+
+    def test_repair_is_bounded(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        current = problem.generate_random_state(random.Random(1))
+        state = repair(problem, current, max_steps=2)
+        assert sum(a != b for a, b in zip(current, state)) <= 4
+        assert problem.value(state) >= problem.value(current)
+
+    def test_reschedule_keeps_a_good_schedule(self):
+        problem = PyCampScheduleProblem(_load_data_example())
+        current = random_restart_hill_climbing(problem, seed=1, max_iters=3)
+        fresh = PyCampScheduleProblem(_load_data_example())
+        assert reschedule_problem(fresh, current, time_budget=10) == current
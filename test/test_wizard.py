@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import datetime, timedelta
+from unittest.mock import patch
 from pycamp_bot.models import Pycamp, Pycampista, Slot
 from pycamp_bot.commands import wizard
 from test.conftest import use_test_database, test_db, MODELS
@@ -160,6 +161,49 @@ class TestDefineWizardsSchedule(BaseForOtherWizardsTests):
             (isinstance(s, Pycampista) and s.wizard) for s in sched.values()
         )
 
+class TestBusyIntervals(BaseForOtherWizardsTests):
+
+    @use_test_database
+    def test_same_answer_as_pycampista_is_busy(self):
+        gandalf = Pycampista.create(username="gandalf", wizard=True)
+        merlin = Pycampista.create(username="merlin", wizard=True)
+        for h in [9, 11, 12, 16]:
+            Slot.create(code="A1", start=datetime(2024, 6, 21, h, 30), current_wizard=gandalf)
+        Slot.create(code="B1", start=datetime(2024, 6, 22, 10, 0), current_wizard=merlin)
+        busy_intervals = wizard.BusyIntervals([gandalf, merlin])
+
+        for minutes in range(0, 3 * 24 * 60, 20):
+            start = datetime(2024, 6, 20) + timedelta(minutes=minutes)
+            for duration in [1, 45, 150]:
+                period = (start, start + timedelta(minutes=duration))
+                for w in [gandalf, merlin]:
+                    assert busy_intervals.is_busy(w, *period) == w.is_busy(*period)
+
+    @use_test_database
+    def test_slot_start_as_hour_is_busy_every_day(self):
+        gandalf = Pycampista.create(username="gandalf", wizard=True)
+        Slot.create(code="A1", start=10, current_wizard=gandalf)
+        busy_intervals = wizard.BusyIntervals([gandalf])
+        assert busy_intervals.is_busy(
+            gandalf, datetime(2024, 6, 21, 10, 0), datetime(2024, 6, 21, 11, 0))
+        assert not busy_intervals.is_busy(
+            gandalf, datetime(2024, 6, 21, 14, 0), datetime(2024, 6, 21, 15, 0))
+
+    @use_test_database
+    def test_schedule_queries_do_not_grow_with_slots(self):
+        self.init_pycamp()
+        gandalf = self.pycamp.add_wizard("gandalf", 1)
+        self.pycamp.add_wizard("merlin", 2)
+        for h in [9, 10, 11, 12]:
+            Slot.create(code="A1", start=datetime(2024, 6, 21, h, 30), current_wizard=gandalf)
+
+        execute_sql = test_db.execute_sql
+        with patch.object(test_db, "execute_sql", side_effect=execute_sql) as spy:
+            sched = wizard.define_wizards_schedule(self.pycamp)
+        assert len(sched) > 10
+        assert spy.call_count == 2
+
+
 class TestListWizards(BaseForOtherWizardsTests):
 
     @use_test_database